@@ -0,0 +1,102 @@
+import json
+import os
+import time
+from pathlib import Path
+
+# Scraper state that should survive between runs (prize lookups, HTTP validators, ...).
+CACHE_DIR = Path(os.getenv("HACKRADAR_CACHE_DIR", ".cache"))
+
+
+class JsonCache:
+    """A small persistent key/value store with a per-entry TTL, kept in one JSON file."""
+
+    def __init__(self, path: Path, ttl: float | None = None):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._entries = {}
+        self._dirty = False
+        try:
+            self._entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _expired(self, entry, now) -> bool:
+        return self.ttl is not None and now - entry["stored_at"] > self.ttl
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None or self._expired(entry, time.time()):
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value):
+        self._entries[key] = {"stored_at": time.time(), "value": value}
+        self._dirty = True
+
+    def save(self):
+        """Write the cache back to disk, dropping expired entries. No-op if nothing changed."""
+        if not self._dirty:
+            return
+        now = time.time()
+        self._entries = {k: e for k, e in self._entries.items() if not self._expired(e, now)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._entries))
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+# Validators older than this are ignored, which forces an occasional full re-download
+# and re-parse even if a server keeps answering 304.
+HTTP_CACHE_TTL = 7 * 24 * 60 * 60
+
+
+class HttpCache(JsonCache):
+    """
+    ETag/Last-Modified validators and bodies for one source's GET requests.
+
+    Counts hits (304 Not Modified) and misses (full responses) for the current run.
+    With `conditional=False` no validators are sent (every page is downloaded and parsed)
+    but fresh ones are still recorded; this is used for periodic full resyncs.
+    """
+
+    def __init__(self, name: str, ttl: float | None = HTTP_CACHE_TTL, conditional: bool = True):
+        super().__init__(CACHE_DIR / "http" / f"{name}.json", ttl=ttl)
+        self.name = name
+        self.conditional = conditional
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def request_key(url: str, params: dict | None = None) -> str:
+        return json.dumps([url, sorted((params or {}).items())], default=str)
+
+    def store(self, key: str, etag: str | None, last_modified: str | None, body):
+        if etag or last_modified:
+            self.set(key, {"etag": etag, "last_modified": last_modified, "body": body})
+        elif self._entries.pop(key, None) is not None:
+            self._dirty = True
+
+
+_http_caches: dict[str, HttpCache] = {}
+
+
+def http_cache(name: str, conditional: bool = True) -> HttpCache:
+    """
+    Return this process's HTTP cache for a source, loading it from disk on first use.
+    `conditional` only applies when the cache is first opened for a run.
+    """
+    if name not in _http_caches:
+        _http_caches[name] = HttpCache(name, conditional=conditional)
+    return _http_caches[name]
+
+
+def close_http_cache(name: str, persist: bool = True) -> HttpCache | None:
+    """
+    Finish a source's run. Its validators are written to disk only if `persist` is set,
+    i.e. after the fetched rows were stored, so a 304 never hides rows that were lost.
+    """
+    cache = _http_caches.pop(name, None)
+    if cache is not None and persist:
+        cache.save()
+    return cache
@@ -1,120 +1,179 @@
-import requests
+import asyncio
 import hashlib
+import json
+from collections.abc import AsyncIterator
 from backend.schemas import Hackathon
 from datetime import datetime
+from adapters.cache import CACHE_DIR, JsonCache, http_cache
+from adapters.http import RequestError, fetch_all, get_json, get_json_cached
+from adapters.pagination import fetch_pages
+
+LIST_URL = "https://api.devfolio.co/api/hackathons"
+
+# Prize lookups are one request per hackathon, so they run concurrently and are cached
+# by slug. A cached entry is reused until it expires or the event's listing changes.
+PRIZE_CONCURRENCY = 8
+PRIZE_CACHE_FILE = CACHE_DIR / "devfolio_prizes.json"
+PRIZE_CACHE_TTL = 7 * 24 * 60 * 60
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+def format_devfolio_prizes(prizes_data) -> str:
+    prize_pool = "See details"
+    if prizes_data:
+        prize_list = []
+        for p in prizes_data:
+            p_name = p.get("name", "")
+            p_amount = p.get("amount")
+            p_desc = p.get("desc", "")
+            if p_amount and float(p_amount) > 0:
+                prize_list.append(f"{p_name}: ${p_amount}")
+            elif p_desc:
+                # If no amount, maybe use description or just name
+                prize_list.append(f"{p_name}")
+
+        if prize_list:
+            # Format as vertical list with bullet points
+            prize_pool = "\n".join([f"- {p}" for p in prize_list[:3]])
+            if len(prize_list) > 3:
+                prize_pool += "\n- ..."
+    return prize_pool
+
+
+async def fetch_devfolio_prizes(client, slug: str) -> str | None:
+    """Fetch and format a hackathon's prizes. Returns None if the lookup failed."""
+    try:
+        prizes_url = f"https://api.devfolio.co/api/hackathons/{slug}/prizes"
+        prizes_data = await get_json(client, prizes_url, headers=HEADERS, timeout=5)
+        return format_devfolio_prizes(prizes_data)
+    except Exception as e:
+        print(f"Error fetching prizes for {slug}: {e}")
+        return None
+
+
+def listing_fingerprint(item) -> str:
+    return hashlib.sha256(json.dumps(item, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def resolve_prizes(client, items, cache: JsonCache) -> list[str]:
+    """Return the prize pool for each listing item, fetching only new or changed slugs."""
+    semaphore = asyncio.Semaphore(PRIZE_CONCURRENCY)
+
+    async def lookup(item):
+        slug = item.get("slug")
+        fingerprint = listing_fingerprint(item)
+        cached = cache.get(slug) if slug else None
+        if cached and cached["fingerprint"] == fingerprint:
+            return cached["prize_pool"]
+
+        async with semaphore:
+            prize_pool = await fetch_devfolio_prizes(client, slug)
+        if prize_pool is None:
+            return "See details"
+        if slug:
+            cache.set(slug, {"fingerprint": fingerprint, "prize_pool": prize_pool})
+        return prize_pool
+
+    return await asyncio.gather(*(lookup(item) for item in items))
+
+
+def parse_devfolio_item(item, prize_pool: str) -> Hackathon | None:
+    title = item.get("name")
+    slug = item.get("slug")
+    url = f"https://{slug}.devfolio.co/" if slug else None
+    banner_link = item.get("cover_img")
+    start_str = item.get("starts_at")
+    end_str = item.get("ends_at")
+    registation_link = f"{url}/application"
+
+    start_date = None
+    end_date = None
+
+    if start_str:
+        try:
+            start_date = datetime.fromisoformat(start_str.replace("Z", "+00:00")).date()
+        except ValueError:
+            pass
 
-
-def fetch_devfolio_hackathons():
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
-    hackathons = []
-    page = 1
-    while True:
+    if end_str:
         try:
-            response = requests.get(
-                "https://api.devfolio.co/api/hackathons",
+            end_date = datetime.fromisoformat(end_str.replace("Z", "+00:00")).date()
+        except ValueError:
+            pass
+
+    # Determine status based on dates
+    status = "Open"
+    today = datetime.now().date()
+    if start_date and end_date:
+        if today > end_date:
+            status = "Ended"
+        elif today >= start_date:
+            status = "Live"
+        else:
+            status = "Upcoming"  # or Open for registration
+
+    # Since we are filtering by 'application_open', they are likely Open/Upcoming
+    # But let's stick to a simple mapping if needed, or just use the calculated one.
+
+    if not (title and start_date and end_date and url):
+        return None
+
+    return Hackathon(
+        id=hashlib.sha256(title.encode()).hexdigest(),
+        title=title,
+        start_date=start_date,
+        end_date=end_date,
+        location=item.get("location") or "Everywhere",
+        url=url,
+        mode="Online" if item.get("is_online") else "Offline",
+        status=status,
+        source="devfolio",
+        banner_url=banner_link,
+        registation_link=registation_link,
+        prize_pool=prize_pool,
+        team_size=f"{item.get('team_min', 1)}-{item.get('team_size', 4)} members",
+        eligibility="Open to all",  # Devfolio is generally open, API doesn't specify restrictions clearly in list
+    )
+
+
+async def fetch(client) -> AsyncIterator[Hackathon]:
+    cache = http_cache("devfolio")
+
+    async def fetch_page(page):
+        try:
+            data, modified = await get_json_cached(
+                client,
+                LIST_URL,
+                cache=cache,
                 params={"filter": "application_open", "page": page},
-                headers=headers,
+                headers=HEADERS,
             )
-            response.raise_for_status()
-            data = response.json()
-
-            if "result" not in data or not data["result"]:
-                break
-
-            for item in data["result"]:
-                title = item.get("name")
-                slug = item.get("slug")
-                url = f"https://{slug}.devfolio.co/" if slug else None
-                banner_link = item.get("cover_img")
-                start_str = item.get("starts_at")
-                end_str = item.get("ends_at")
-                registation_link = f"{url}/application"
-
-                start_date = None
-                end_date = None
-
-                if start_str:
-                    try:
-                        start_date = datetime.fromisoformat(start_str.replace("Z", "+00:00")).date()
-                    except ValueError:
-                        pass
-
-                if end_str:
-                    try:
-                        end_date = datetime.fromisoformat(end_str.replace("Z", "+00:00")).date()
-                    except ValueError:
-                        pass
-
-                # Determine status based on dates
-                status = "Open"
-                today = datetime.now().date()
-                if start_date and end_date:
-                    if today > end_date:
-                        status = "Ended"
-                    elif today >= start_date:
-                        status = "Live"
-                    else:
-                        status = "Upcoming"  # or Open for registration
-
-                # Since we are filtering by 'application_open', they are likely Open/Upcoming
-                # But let's stick to a simple mapping if needed, or just use the calculated one.
-
-                # Fetch prizes
-                prize_pool = "See details"
-                try:
-                    prizes_url = f"https://api.devfolio.co/api/hackathons/{slug}/prizes"
-                    prizes_resp = requests.get(prizes_url, headers=headers, timeout=5)
-                    if prizes_resp.status_code == 200:
-                        prizes_data = prizes_resp.json()
-                        if prizes_data:
-                            prize_list = []
-                            for p in prizes_data:
-                                p_name = p.get("name", "")
-                                p_amount = p.get("amount")
-                                p_desc = p.get("desc", "")
-                                if p_amount and float(p_amount) > 0:
-                                    prize_list.append(f"{p_name}: ${p_amount}")
-                                elif p_desc:
-                                    # If no amount, maybe use description or just name
-                                    prize_list.append(f"{p_name}")
-
-                            if prize_list:
-                                # Format as vertical list with bullet points
-                                prize_pool = "\n".join([f"- {p}" for p in prize_list[:3]])
-                                if len(prize_list) > 3:
-                                    prize_pool += "\n- ..."
-                except Exception as e:
-                    print(f"Error fetching prizes for {slug}: {e}")
-
-                if title and start_date and end_date and url:
-                    hackathon = Hackathon(
-                        id=hashlib.sha256(title.encode()).hexdigest(),
-                        title=title,
-                        start_date=start_date,
-                        end_date=end_date,
-                        location=item.get("location") or "Everywhere",
-                        url=url,
-                        mode="Online" if item.get("is_online") else "Offline",
-                        status=status,
-                        source="devfolio",
-                        banner_url=banner_link,
-                        registation_link=registation_link,
-                        prize_pool=prize_pool,
-                        team_size=f"{item.get('team_min', 1)}-{item.get('team_size', 4)} members",
-                        eligibility="Open to all",  # Devfolio is generally open, API doesn't specify restrictions clearly in list
-                    )
-                    hackathons.append(hackathon)
-
-            page += 1
-
-        except requests.exceptions.RequestException as e:
+        except RequestError as e:
             print(f"Error fetching page {page}: {e}")
-            break
-
-    return hackathons
+            return None
+        items = data.get("result")
+        return (items, modified) if items else None
+
+    prize_cache = JsonCache(PRIZE_CACHE_FILE, ttl=PRIZE_CACHE_TTL)
+    try:
+        # The API does not report a page count, so pages are probed until the first empty one.
+        async for _, (items, modified) in fetch_pages(fetch_page):
+            if not modified:
+                continue  # unchanged since the last run, already stored
+            prize_pools = await resolve_prizes(client, items, prize_cache)
+            for item, prize_pool in zip(items, prize_pools):
+                hackathon = parse_devfolio_item(item, prize_pool)
+                if hackathon:
+                    yield hackathon
+    finally:
+        prize_cache.save()
+
+
+def fetch_devfolio_hackathons() -> list[Hackathon]:
+    return fetch_all(fetch)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,21 @@
-import requests
 import hashlib
 import json
+from collections.abc import AsyncIterator
 from bs4 import BeautifulSoup
 from datetime import datetime
 from backend.schemas import Hackathon
 from pydantic import ValidationError
+from adapters.cache import http_cache
+from adapters.http import RequestError, fetch_all, get_json_cached, get_text
+from adapters.pagination import is_known_page
 
 
-def get_banner_from_page(url: str) -> str | None:
+async def get_banner_from_page(client, url: str) -> str | None:
     if not url:
         return None
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.content, "html.parser")
+        html = await get_text(client, url, timeout=10)
+        soup = BeautifulSoup(html, "html.parser")
         script = soup.find("script", type="application/ld+json")
         if script:
             data = json.loads(script.string)
@@ -114,67 +116,87 @@ def format_devpost_prizes(item):
     return "\n".join(prizes)
 
 
-def fetch_devpost_hackathons() -> list[Hackathon]:
+async def fetch(client, known_ids: set[str] | None = None) -> AsyncIterator[Hackathon]:
     """
-    Fetches and validates hackathon data from the first 20 pages of the official Devpost API.
+    Fetches and validates hackathon data from the first 3 pages of the official Devpost API.
+    Listings are newest-first, so with `known_ids` (incremental mode) it stops at the first
+    page that is unchanged or holds only known hackathons.
     """
-    hackathons = []
+    cache = http_cache("devpost")
     for page in range(1, 4):
         print(f"Fetching Devpost page {page}...")
         url = f"https://devpost.com/api/hackathons?page={page}"
         try:
-            resp = requests.get(url)
-            resp.raise_for_status()
-            hackathon_data = resp.json().get("hackathons", [])
-        except requests.RequestException as e:
+            data, modified = await get_json_cached(client, url, cache=cache)
+            if not modified:
+                if known_ids is not None:
+                    break
+                continue  # unchanged since the last run, already stored
+            hackathon_data = data.get("hackathons", [])
+        except RequestError as e:
             print(f"Error fetching URL (page {page}): {e}")
             continue
         except ValueError:
             print(f"Error decoding JSON from response on page {page}.")
             continue
 
+        hackathons = []
         for item in hackathon_data:
             if item.get("open_state") == "ended":
                 break
-            start_date, end_date = parse_hackathon_dates(item.get("submission_period_dates"))
-
-            mode = "Online"
-            location: str
-            if item.get("displayed_location"):
-                location = item["displayed_location"].get("location", "Online")
-            if location != "Online":
-                mode = "Offline"
-            else:
-                location = "Everywhere"
-
-            banner_url = item.get("thumbnail_url")
-            if banner_url:
-                if banner_url.startswith("//"):
-                    banner_url = f"https:{banner_url}"
-                banner_url = banner_url.replace("medium_square", "original")
-
-            try:
-                hackathon = Hackathon(
-                    id=hashlib.sha256(str(item.get("id")).encode()).hexdigest(),
-                    title=item.get("title"),
-                    start_date=start_date,
-                    end_date=end_date,
-                    location=location,
-                    url=item.get("url"),
-                    mode=mode,
-                    status=item.get("open_state"),
-                    source="devpost",
-                    tags=[theme["name"] for theme in item.get("themes", [])],
-                    banner_url=banner_url,
-                    prize_pool=format_devpost_prizes(item),
-                    team_size="See details",
-                    eligibility="See details",
-                )
+            hackathon = parse_devpost_item(item)
+            if hackathon:
                 hackathons.append(hackathon)
-            except ValidationError as e:
-                print(f"Skipping hackathon due to validation error: {item.get('title')}")
-                print(e)
-    return hackathons
+
+        if is_known_page(hackathons, known_ids):
+            break
+        for hackathon in hackathons:
+            yield hackathon
+
+
+def parse_devpost_item(item) -> Hackathon | None:
+    start_date, end_date = parse_hackathon_dates(item.get("submission_period_dates"))
+
+    mode = "Online"
+    location: str
+    if item.get("displayed_location"):
+        location = item["displayed_location"].get("location", "Online")
+    if location != "Online":
+        mode = "Offline"
+    else:
+        location = "Everywhere"
+
+    banner_url = item.get("thumbnail_url")
+    if banner_url:
+        if banner_url.startswith("//"):
+            banner_url = f"https:{banner_url}"
+        banner_url = banner_url.replace("medium_square", "original")
+
+    try:
+        return Hackathon(
+            id=hashlib.sha256(str(item.get("id")).encode()).hexdigest(),
+            title=item.get("title"),
+            start_date=start_date,
+            end_date=end_date,
+            location=location,
+            url=item.get("url"),
+            mode=mode,
+            status=item.get("open_state"),
+            source="devpost",
+            tags=[theme["name"] for theme in item.get("themes", [])],
+            banner_url=banner_url,
+            prize_pool=format_devpost_prizes(item),
+            team_size="See details",
+            eligibility="See details",
+        )
+    except ValidationError as e:
+        print(f"Skipping hackathon due to validation error: {item.get('title')}")
+        print(e)
+        return None
+
+
+def fetch_devpost_hackathons() -> list[Hackathon]:
+    return fetch_all(fetch)
 
 
 if __name__ == "__main__":
@@ -1,97 +1,153 @@
-import requests
+import asyncio
 import hashlib
+import math
+from collections.abc import AsyncIterator
+from aiohttp import ClientResponseError
 from backend.schemas import Hackathon
 from datetime import datetime
+from adapters.cache import HttpCache, http_cache
+from adapters.http import RequestError, fetch_all, get_json_cached
+from adapters.pagination import fetch_pages, is_known_page
+
+BASE_URL = "https://dorahacks.io/api/hackathon/"
+PAGE_SIZE = 24
+STATUSES = ["upcoming", "ongoing"]
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
+}
+
+
+async def fetch_status(
+    client, status: str, cache: HttpCache, known_ids: set[str] | None = None
+) -> list[Hackathon]:
+    """
+    Fetch every page of one status listing; pages after the first are fetched in parallel.
+    Returns the hackathons of pages that changed since the last run. Listings are
+    newest-first, so with `known_ids` it stops at the first unchanged or fully known page.
+    """
+
+    def params(page):
+        return {"page": page, "page_size": PAGE_SIZE, "status": status}
+
+    async def get_page(page):
+        return await get_json_cached(
+            client, BASE_URL, cache=cache, params=params(page), headers=HEADERS
+        )
+
+    async def fetch_page(page):
+        try:
+            data, modified = await get_page(page)
+        except ClientResponseError as e:
+            if e.status == 404:  # past the last page
+                return None
+            raise
+        items = data.get("results")
+        return (items, modified) if items else None
+
+    first, first_modified = await get_page(1)
+
+    if first.get("count") is not None:
+        last_page = math.ceil(first["count"] / PAGE_SIZE)
+    elif first.get("next"):
+        last_page = None
+    else:
+        last_page = 1
+
+    async def pages():
+        yield first.get("results", []), first_modified
+        async for _, page in fetch_pages(fetch_page, first_page=2, last_page=last_page):
+            yield page
+
+    results = []
+    async for items, modified in pages():
+        if not modified:
+            if known_ids is not None:
+                break
+            continue  # unchanged since the last run, already stored
+        hackathons = [parse_dorahacks_item(hack) for hack in items]
+        if is_known_page(hackathons, known_ids):
+            break
+        results.extend(hackathons)
+    return results
+
+
+async def fetch(client, known_ids: set[str] | None = None) -> AsyncIterator[Hackathon]:
+    # Fetch upcoming and ongoing hackathons with pagination
+    cache = http_cache("dorahacks")
+    listings = await asyncio.gather(
+        *(fetch_status(client, status, cache, known_ids) for status in STATUSES),
+        return_exceptions=True,
+    )
+    for listing in listings:
+        if isinstance(listing, RequestError):
+            print(f"Error fetching hackathons from DoraHacks: {listing}")
+            return
+        if isinstance(listing, BaseException):
+            raise listing
+
+    for listing in listings:
+        for hackathon in listing:
+            yield hackathon
+
+
+def parse_dorahacks_item(hack) -> Hackathon:
+    start_date = datetime.fromtimestamp(hack.get("start_time")) if hack.get("start_time") else None
+    end_date = datetime.fromtimestamp(hack.get("end_time")) if hack.get("end_time") else None
+
+    curr_status = hack.get("status")
+    status = "upcoming" if curr_status == 0 else "ongoing"
+    mode = "Online" if hack.get("participation_form") == "Virtual" else "Offline"
+    location = "Everywhere" if not hack.get("venue_name") else hack.get("venue_name")
+
+    # Fetch prizes
+    prize_pool = "See details"
+    try:
+        # DoraHacks doesn't have a specific prizes endpoint, but the detail endpoint has 'amount' and 'token'
+        # or sometimes it's in the description.
+        # Based on analysis, 'amount' (bonus_price in some contexts) seems to be the total prize pool.
+        # Let's fetch details by ID to be sure, or use the list item if available.
+
+        # The list item 'hack' might already have it?
+        # In the list response (from previous analysis), we didn't see 'amount' directly.
+        # But let's try to fetch details if we want to be accurate.
+        # However, to avoid too many requests, let's check if 'bonus_price' or similar is in 'hack' object first.
+
+        amount = hack.get("bonus_price")
+        token = hack.get("token", "USD")
+
+        if amount:
+            prize_pool = f"- Total: {amount} {token}"
+        else:
+            # If not in list, try detail fetch (optional, might slow down)
+            # For now, let's stick to list data if possible to avoid 20+ requests per run.
+            # If 'bonus_price' is 0 or missing, we default to "See details".
+            pass
+
+    except Exception as e:
+        print(f"Error processing prizes for {hack.get('title')}: {e}")
+
+    hackathon = Hackathon(
+        id=hashlib.sha256(hack.get("title").encode()).hexdigest(),
+        title=hack.get("title"),
+        start_date=start_date.date() if start_date else None,
+        end_date=end_date.date() if end_date else None,
+        location=location,
+        url=f"https://dorahacks.io/hackathon/{hack.get('uname')}/detail",
+        mode=mode,
+        status=status,
+        source="dorahacks",
+        tags=hack.get("field"),
+        banner_url=hack.get("image_url"),
+        prize_pool=prize_pool,
+        team_size="See details",
+        eligibility="See details",
+    )
+    return hackathon
 
 
 def fetch_dorahacks_hackathons() -> list[Hackathon]:
-    base_url = "https://dorahacks.io/api/hackathon/"
-
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
-    }
-
-    try:
-        all_hackathons = []
-        # Fetch upcoming and ongoing hackathons with pagination
-        for status in ["upcoming", "ongoing"]:
-            url = base_url
-            params = {"page": 1, "page_size": 24, "status": status}
-
-            while url:
-                response = requests.get(url, params=params, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-
-                all_hackathons.extend(data.get("results", []))
-
-                # Get the next page URL, if it exists
-                url = data.get("next")
-                # Subsequent requests use the full URL from 'next', so we clear params
-                params = None
-
-        hackathons_data = []
-        for hack in all_hackathons:
-            start_date = (
-                datetime.fromtimestamp(hack.get("start_time")) if hack.get("start_time") else None
-            )
-            end_date = (
-                datetime.fromtimestamp(hack.get("end_time")) if hack.get("end_time") else None
-            )
-
-            curr_status = hack.get("status")
-            status = "upcoming" if curr_status == 0 else "ongoing"
-            mode = "Online" if hack.get("participation_form") == "Virtual" else "Offline"
-            location = "Everywhere" if not hack.get("venue_name") else hack.get("venue_name")
-
-            # Fetch prizes
-            prize_pool = "See details"
-            try:
-                # DoraHacks doesn't have a specific prizes endpoint, but the detail endpoint has 'amount' and 'token'
-                # or sometimes it's in the description.
-                # Based on analysis, 'amount' (bonus_price in some contexts) seems to be the total prize pool.
-                # Let's fetch details by ID to be sure, or use the list item if available.
-
-                # The list item 'hack' might already have it?
-                # In the list response (from previous analysis), we didn't see 'amount' directly.
-                # But let's try to fetch details if we want to be accurate.
-                # However, to avoid too many requests, let's check if 'bonus_price' or similar is in 'hack' object first.
-
-                amount = hack.get("bonus_price")
-                token = hack.get("token", "USD")
-
-                if amount:
-                    prize_pool = f"- Total: {amount} {token}"
-                else:
-                    # If not in list, try detail fetch (optional, might slow down)
-                    # For now, let's stick to list data if possible to avoid 20+ requests per run.
-                    # If 'bonus_price' is 0 or missing, we default to "See details".
-                    pass
-
-            except Exception as e:
-                print(f"Error processing prizes for {hack.get('title')}: {e}")
-
-            hackathon = Hackathon(
-                id=hashlib.sha256(hack.get("title").encode()).hexdigest(),
-                title=hack.get("title"),
-                start_date=start_date.date() if start_date else None,
-                end_date=end_date.date() if end_date else None,
-                location=location,
-                url=f"https://dorahacks.io/hackathon/{hack.get('uname')}/detail",
-                mode=mode,
-                status=status,
-                source="dorahacks",
-                tags=hack.get("field"),
-                banner_url=hack.get("image_url"),
-                prize_pool=prize_pool,
-                team_size="See details",
-                eligibility="See details",
-            )
-            hackathons_data.append(hackathon)
-        return hackathons_data
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching hackathons from DoraHacks: {e}")
-        return []
+    return fetch_all(fetch)
 
 
 if __name__ == "__main__":
@@ -1,21 +1,23 @@
-import requests
 import hashlib
+from collections.abc import AsyncIterator
 from datetime import datetime
 from backend.schemas import Hackathon
+from adapters.http import RequestError, fetch_all, get_json
 
 BASE_URL = "https://vision.hack2skill.com/api/v1/innovator/public/event/public-list"
 
 
-def fetch_hack2skill_hackathons(page: int = 1, records: int = 50) -> list[Hackathon]:
+async def fetch(client, page: int = 1, records: int = 50) -> AsyncIterator[Hackathon]:
     """
     Fetches hackathons from Hack2Skill platform.
 
     Args:
+        client: Shared HTTP client
         page: Page number to fetch (default: 1)
         records: Number of records per page (default: 50)
 
-    Returns:
-        List of Hackathon objects
+    Yields:
+        Hackathon objects
     """
     try:
         # Set date range - from current date to 1 years in the future
@@ -30,17 +32,13 @@ def fetch_hack2skill_hackathons(page: int = 1, records: int = 50) -> list[Hackat
             "end": end_date.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
         }
 
-        response = requests.get(BASE_URL, params=params, timeout=10)
-        response.raise_for_status()
-
-        data = response.json()
+        data = await get_json(client, BASE_URL, params=params, timeout=10)
 
         if not data.get("success"):
             print(f"API returned success=false: {data.get('message')}")
-            return []
+            return
 
         events = data.get("data", [])
-        hackathons = []
 
         for event in events:
             try:
@@ -132,23 +130,23 @@ def fetch_hack2skill_hackathons(page: int = 1, records: int = 50) -> list[Hackat
                     eligibility="See event page",  # API doesn't provide eligibility info
                 )
 
-                hackathons.append(hackathon)
-
             except Exception as e:
                 print(f"Error processing event {event.get('title', 'Unknown')}: {e}")
                 continue
 
-        return hackathons
+            yield hackathon
 
-    except requests.exceptions.RequestException as e:
+    except RequestError as e:
         print(f"Error fetching Hack2Skill hackathons: {e}")
-        return []
     except Exception as e:
         print(f"Unexpected error: {e}")
         import traceback
 
         traceback.print_exc()
-        return []
+
+
+def fetch_hack2skill_hackathons(page: int = 1, records: int = 50) -> list[Hackathon]:
+    return fetch_all(fetch, page=page, records=records)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import asyncio
+
+import aiohttp
+
+from adapters.cache import HttpCache
+
+# One pooled, keep-alive client is shared by every source in a scrape run, so each
+# host pays for DNS, TCP and TLS setup once instead of once per page.
+MAX_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = 8
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+DEFAULT_TIMEOUT = 30
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+}
+
+# Errors an adapter should treat as "this request failed" (network, HTTP status, timeout).
+RequestError = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def create_client() -> aiohttp.ClientSession:
+    """Create the shared HTTP client. Must be called from inside a running event loop."""
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=DEFAULT_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+    )
+
+
+def _timeout(seconds: float | None):
+    return aiohttp.ClientTimeout(total=seconds) if seconds else None
+
+
+async def get_json(
+    client: aiohttp.ClientSession,
+    url: str,
+    *,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float | None = None,
+):
+    """GET a URL and decode the JSON body. Raises for non-2xx responses."""
+    async with client.get(url, params=params, headers=headers, timeout=_timeout(timeout)) as resp:
+        resp.raise_for_status()
+        return await resp.json(content_type=None)
+
+
+async def get_json_cached(
+    client: aiohttp.ClientSession,
+    url: str,
+    *,
+    cache: HttpCache,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float | None = None,
+) -> tuple[object, bool]:
+    """
+    Conditional GET of a JSON document. Returns `(data, modified)`.
+
+    Stored ETag/Last-Modified validators are sent as If-None-Match/If-Modified-Since.
+    On a 304 the cached body is returned with `modified=False`, so callers can skip
+    parsing and storing a page that has not changed since the last run.
+    """
+    key = cache.request_key(url, params)
+    entry = cache.get(key) if cache.conditional else None
+    request_headers = dict(headers or {})
+    if entry:
+        if entry["etag"]:
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    async with client.get(
+        url, params=params, headers=request_headers, timeout=_timeout(timeout)
+    ) as resp:
+        if resp.status == 304 and entry:
+            cache.hits += 1
+            return entry["body"], False
+        resp.raise_for_status()
+        data = await resp.json(content_type=None)
+        cache.misses += 1
+        cache.store(key, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), data)
+        return data, True
+
+
+async def get_text(
+    client: aiohttp.ClientSession,
+    url: str,
+    *,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float | None = None,
+) -> str:
+    """GET a URL and return the decoded body. Raises for non-2xx responses."""
+    async with client.get(url, params=params, headers=headers, timeout=_timeout(timeout)) as resp:
+        resp.raise_for_status()
+        return await resp.text()
+
+
+async def collect(fetch, client: aiohttp.ClientSession, **kwargs) -> list:
+    """Drain an adapter's async `fetch(client)` generator into a list."""
+    return [hackathon async for hackathon in fetch(client, **kwargs)]
+
+
+def fetch_all(fetch, **kwargs) -> list:
+    """Run a single adapter to completion on a fresh client (for scripts and debugging)."""
+
+    async def run():
+        async with create_client() as client:
+            return await collect(fetch, client, **kwargs)
+
+    return asyncio.run(run())
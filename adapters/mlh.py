@@ -1,24 +1,28 @@
+import asyncio
 import cloudscraper
+from collections.abc import AsyncIterator
 from bs4 import BeautifulSoup
 from backend.schemas import Hackathon
 import hashlib
 from datetime import date
+from adapters.http import fetch_all
 
 
-def scrape_mlh_events() -> list[Hackathon]:
+async def fetch(client) -> AsyncIterator[Hackathon]:
+    # MLH sits behind Cloudflare's browser check, which only cloudscraper gets past,
+    # so this source cannot use the shared client; its blocking request runs in a thread.
     current_year = date.today().year + 1
     url = f"https://mlh.io/seasons/{current_year}/events"
 
-    events = []
     scraper = cloudscraper.create_scraper()
 
-    response = scraper.get(url)
+    response = await asyncio.to_thread(scraper.get, url)
 
     if response.status_code != 200:
         print(
             f"Failed to fetch MLH page for season {current_year}. Status code: {response.status_code}"
         )
-        return []
+        return
 
     soup = BeautifulSoup(response.text, "html.parser")
     event_divs = soup.find_all("div", class_="event")
@@ -69,9 +73,11 @@ def scrape_mlh_events() -> list[Hackathon]:
             team_size="See details",
             eligibility="Student Only",  # MLH is generally student focused
         )
-        events.append(hackathon)
+        yield hackathon
+
 
-    return events
+def scrape_mlh_events() -> list[Hackathon]:
+    return fetch_all(fetch)
 
 
 if __name__ == "__main__":
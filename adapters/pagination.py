@@ -0,0 +1,54 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+# Pages of one listing fetched at the same time. The shared client's connector also caps
+# open connections per host (adapters.http.MAX_CONNECTIONS_PER_HOST), so sources that hit
+# the same host (e.g. Devfolio listings and prizes) cannot together exceed that limit.
+PAGE_CONCURRENCY = 4
+
+
+async def fetch_pages(
+    fetch_page: Callable[[int], Awaitable],
+    *,
+    first_page: int = 1,
+    last_page: int | None = None,
+    concurrency: int = PAGE_CONCURRENCY,
+) -> AsyncIterator[tuple[int, object]]:
+    """
+    Fetch pages concurrently and yield `(page, payload)` in page order.
+
+    `fetch_page(page)` returns the page payload, or None when the page is past the end.
+    At most `concurrency` pages are in flight, starting from the next page to be yielded,
+    so a caller that stops iterating early wastes at most `concurrency - 1` requests.
+    If `last_page` is unknown, pages are probed until the first empty one. An exception
+    from a page is raised only after all earlier pages were yielded.
+    """
+    next_page = first_page
+    pending = deque()
+
+    def schedule():
+        nonlocal next_page
+        while len(pending) < concurrency and (last_page is None or next_page <= last_page):
+            pending.append((next_page, asyncio.ensure_future(fetch_page(next_page))))
+            next_page += 1
+
+    schedule()
+    try:
+        while pending:
+            page, task = pending.popleft()
+            payload = await task
+            if payload is None:
+                return
+            schedule()
+            yield page, payload
+    finally:
+        for _, task in pending:
+            task.cancel()
+        # Retrieve results of cancelled/finished look-ahead pages so errors are not logged.
+        await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+
+def is_known_page(hackathons, known_ids: set[str] | None) -> bool:
+    """True if incremental mode is on and every hackathon on a page was seen before."""
+    return known_ids is not None and bool(hackathons) and all(h.id in known_ids for h in hackathons)
@@ -0,0 +1,70 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import crud
+
+# Async twins of the backend.crud functions used by the slash-command handlers, for use with
+# an AsyncSessionLocal() session. Each one runs the sync function through
+# AsyncSession.run_sync: the queries are shared, but every statement goes through the
+# asyncio driver (asyncpg or aiosqlite), so waiting on the database never blocks the loop.
+
+
+async def search_hackathons(db: AsyncSession, keyword: str, limit: int = 3):
+    return await db.run_sync(crud.search_hackathons, keyword, limit)
+
+
+async def suggest_tags(db: AsyncSession, prefix: str, limit: int = 25):
+    return await db.run_sync(crud.suggest_tags, prefix, limit)
+
+
+async def get_hackathons_by_platform(db: AsyncSession, platform_name: str, limit: int = 3):
+    return await db.run_sync(crud.get_hackathons_by_platform, platform_name, limit)
+
+
+async def get_upcoming_hackathons(db: AsyncSession, days: int = 7):
+    return await db.run_sync(crud.get_upcoming_hackathons, days)
+
+
+async def subscribe_user(db: AsyncSession, user_id: int, theme: str):
+    return await db.run_sync(crud.subscribe_user, user_id, theme)
+
+
+async def unsubscribe_user(db: AsyncSession, user_id: int, theme: str):
+    return await db.run_sync(crud.unsubscribe_user, user_id, theme)
+
+
+async def get_user_subscriptions(db: AsyncSession, user_id: int):
+    return await db.run_sync(crud.get_user_subscriptions, user_id)
+
+
+async def get_all_guild_configs(db: AsyncSession):
+    return await db.run_sync(crud.get_all_guild_configs)
+
+
+async def update_guild_preferences(
+    db: AsyncSession,
+    guild_id: str,
+    channel_id: str = None,
+    platforms: list = None,
+    themes: list = None,
+):
+    return await db.run_sync(crud.update_guild_preferences, guild_id, channel_id, platforms, themes)
+
+
+async def delete_guild_config(db: AsyncSession, guild_id: str):
+    return await db.run_sync(crud.delete_guild_config, guild_id)
+
+
+async def pause_notifications(db: AsyncSession, guild_id: str):
+    return await db.run_sync(crud.pause_notifications, guild_id)
+
+
+async def resume_notifications(db: AsyncSession, guild_id: str):
+    return await db.run_sync(crud.resume_notifications, guild_id)
+
+
+async def get_bot_setting(db: AsyncSession, key: str):
+    return await db.run_sync(crud.get_bot_setting, key)
+
+
+async def set_bot_setting(db: AsyncSession, key: str, value: str):
+    return await db.run_sync(crud.set_bot_setting, key, value)
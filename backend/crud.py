@@ -1,10 +1,43 @@
+import re
+from sqlalchemy import func, literal_column, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from backend.models import HackathonDB, UserSubscription, GuildConfig
-from backend.schemas import Hackathon
+from backend.models import (
+    HackathonDB,
+    HackathonTag,
+    OutboxEntry,
+    DMChannel,
+    BotSetting,
+    UserSubscription,
+    GuildConfig,
+    SourceWatermark,
+)
+from backend.schemas import Hackathon, normalize_source
 import logging
 from datetime import timedelta
-from datetime import date
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+
+def normalize_tag(tag: str) -> str:
+    return tag.strip().lower()[:100]
+
+
+def replace_hackathon_tags(db: Session, hacks: list[Hackathon]):
+    """Rewrite the hackathon_tags rows of the given hackathons (without committing)."""
+    if not hacks:
+        return
+    db.query(HackathonTag).filter(HackathonTag.hackathon_id.in_([h.id for h in hacks])).delete(
+        synchronize_session=False
+    )
+    rows = [
+        {"hackathon_id": hack.id, "tag": tag}
+        for hack in hacks
+        for tag in {normalize_tag(t) for t in hack.tags if t.strip()}
+    ]
+    if rows:
+        db.execute(HackathonTag.__table__.insert(), rows)
 
 
 def upsert_hackathon(db: Session, hack: Hackathon):
@@ -14,6 +47,9 @@ def upsert_hackathon(db: Session, hack: Hackathon):
     """
     try:
         db_obj = db.query(HackathonDB).filter_by(id=hack.id).first()
+        content_hash = hack.content_hash()
+        if db_obj and db_obj.content_hash == content_hash:
+            return db_obj, False
         if db_obj:
             # Update existing record if needed
             db_obj.title = hack.title
@@ -29,6 +65,8 @@ def upsert_hackathon(db: Session, hack: Hackathon):
             db_obj.prize_pool = hack.prize_pool
             db_obj.team_size = hack.team_size
             db_obj.eligibility = hack.eligibility
+            db_obj.content_hash = content_hash
+            replace_hackathon_tags(db, [hack])
             db.commit()
             return db_obj, False
         else:
@@ -48,8 +86,11 @@ def upsert_hackathon(db: Session, hack: Hackathon):
                 prize_pool=hack.prize_pool,
                 team_size=hack.team_size,
                 eligibility=hack.eligibility,
+                content_hash=content_hash,
             )
             db.add(db_obj)
+            db.flush()
+            replace_hackathon_tags(db, [hack])
             db.commit()
             db.refresh(db_obj)
             return db_obj, True
@@ -63,6 +104,267 @@ def upsert_hackathon(db: Session, hack: Hackathon):
         raise
 
 
+# Rows per INSERT; keeps each statement under SQLite's bound-parameter limit.
+UPSERT_BATCH_SIZE = 500
+
+
+def hackathon_row(hack: Hackathon) -> dict:
+    return {
+        "id": hack.id,
+        "title": hack.title,
+        "start_date": hack.start_date,
+        "end_date": hack.end_date,
+        "location": hack.location,
+        "url": hack.url,
+        "mode": hack.mode,
+        "status": hack.status,
+        "source": hack.source,
+        "tags": ",".join(hack.tags),
+        "banner_url": hack.banner_url,
+        "prize_pool": hack.prize_pool,
+        "team_size": hack.team_size,
+        "eligibility": hack.eligibility,
+        "content_hash": hack.content_hash(),
+    }
+
+
+def upsert_statement(dialect, batch: list[dict]):
+    """INSERT ... ON CONFLICT that only rewrites rows whose content hash changed."""
+    stmt = dialect.insert(HackathonDB).values(batch)
+    return stmt.on_conflict_do_update(
+        index_elements=[HackathonDB.id],
+        set_={k: stmt.excluded[k] for k in batch[0] if k != "id"},
+        where=HackathonDB.content_hash.is_distinct_from(stmt.excluded.content_hash),
+    )
+
+
+def bulk_upsert_hackathons(
+    db: Session, hacks: list[Hackathon], notify: bool = True
+) -> dict[str, set[str]]:
+    """
+    Insert or update many hackathons with one INSERT ... ON CONFLICT per batch and a
+    single commit. Rows whose content hash is unchanged are not rewritten. With `notify`,
+    new hackathons are queued in the outbox in the same transaction.
+    Returns the IDs that were "new", "changed" and "unchanged".
+    """
+    # A statement may not touch the same row twice, so the last copy of an ID wins.
+    latest = {hack.id: hack for hack in hacks}
+    rows = [hackathon_row(hack) for hack in latest.values()]
+    result = {"new": set(), "changed": set(), "unchanged": set()}
+    try:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start : start + UPSERT_BATCH_SIZE]
+            ids = {row["id"] for row in batch}
+            if db.get_bind().dialect.name == "postgresql":
+                # Skipped updates return no row; xmax = 0 marks a fresh insert.
+                stmt = upsert_statement(postgresql, batch).returning(
+                    HackathonDB.id, literal_column("(xmax = 0)")
+                )
+                for row_id, inserted in db.execute(stmt):
+                    result["new" if inserted else "changed"].add(row_id)
+                    ids.discard(row_id)
+                result["unchanged"].update(ids)
+            else:
+                # SQLite has no xmax; stored hashes are read inside the same transaction.
+                stored = dict(
+                    db.query(HackathonDB.id, HackathonDB.content_hash).filter(
+                        HackathonDB.id.in_(ids)
+                    )
+                )
+                db.execute(upsert_statement(sqlite, batch))
+                for row in batch:
+                    if row["id"] not in stored:
+                        result["new"].add(row["id"])
+                    elif stored[row["id"]] != row["content_hash"]:
+                        result["changed"].add(row["id"])
+                    else:
+                        result["unchanged"].add(row["id"])
+        written = result["new"] | result["changed"]
+        replace_hackathon_tags(db, [hack for hack in latest.values() if hack.id in written])
+        if notify:
+            enqueue_outbox(db, BROADCAST, result["new"])
+        db.commit()
+        return result
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in bulk_upsert_hackathons: {e}")
+        raise
+
+
+BROADCAST = "broadcast"
+
+
+def enqueue_outbox(db: Session, target: str, hackathon_ids):
+    """Queue notifications for a target (without committing); already queued ones are kept."""
+    rows = [{"target": target, "hackathon_id": hack_id} for hack_id in sorted(hackathon_ids)]
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = dialect.insert(OutboxEntry).values(rows[start : start + UPSERT_BATCH_SIZE])
+        db.execute(stmt.on_conflict_do_nothing(index_elements=["target", "hackathon_id"]))
+
+
+def claim_outbox(db: Session, lease: timedelta, broadcast: bool = False, limit: int = 1000):
+    """
+    Claim pending outbox rows (and rows whose lease expired) for this caller.
+
+    Each target's rows are claimed with one conditional UPDATE, so concurrent workers never
+    claim the same row. Returns (token, {target: [hackathon_id, ...]}) in queue order.
+    """
+    token = uuid4().hex
+    now = datetime.now()
+    # A pending row's claimed_until, when set, is the earliest time it may be retried.
+    claimable = (
+        (OutboxEntry.status == "pending")
+        & (OutboxEntry.claimed_until.is_(None) | (OutboxEntry.claimed_until <= now))
+    ) | ((OutboxEntry.status == "sending") & (OutboxEntry.claimed_until < now))
+    kind = OutboxEntry.target == BROADCAST if broadcast else OutboxEntry.target != BROADCAST
+    try:
+        targets = [
+            target
+            for (target,) in db.query(OutboxEntry.target)
+            .filter(claimable, kind)
+            .distinct()
+            .order_by(OutboxEntry.target)
+            .limit(limit)
+        ]
+        for target in targets:
+            db.query(OutboxEntry).filter(OutboxEntry.target == target, claimable).update(
+                {
+                    "status": "sending",
+                    "claimed_by": token,
+                    "claimed_until": now + lease,
+                    "attempts": OutboxEntry.attempts + 1,
+                },
+                synchronize_session=False,
+            )
+        db.commit()
+
+        claimed = {}
+        rows = (
+            db.query(OutboxEntry.target, OutboxEntry.hackathon_id)
+            .filter(OutboxEntry.claimed_by == token, OutboxEntry.status == "sending")
+            .order_by(OutboxEntry.id)
+        )
+        for target, hackathon_id in rows:
+            claimed.setdefault(target, []).append(hackathon_id)
+        return token, claimed
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in claim_outbox: {e}")
+        raise
+
+
+def finish_outbox(
+    db: Session,
+    token: str,
+    target: str,
+    error: str | None = None,
+    max_attempts: int = 5,
+    commit: bool = True,
+    retry_delay: timedelta = timedelta(0),
+):
+    """
+    Mark a claimed target as sent, or release it for a retry after an error; a released
+    row is not claimed again for `retry_delay`. Rows that have used `max_attempts` are
+    marked failed. Only rows still held by `token` change.
+    """
+    held = db.query(OutboxEntry).filter(
+        OutboxEntry.claimed_by == token,
+        OutboxEntry.target == target,
+        OutboxEntry.status == "sending",
+    )
+    try:
+        if error is None:
+            held.update({"status": "sent", "claimed_until": None}, synchronize_session=False)
+        else:
+            held.filter(OutboxEntry.attempts >= max_attempts).update(
+                {"status": "failed", "last_error": error, "claimed_until": None},
+                synchronize_session=False,
+            )
+            held.update(
+                {
+                    "status": "pending",
+                    "last_error": error,
+                    "claimed_until": datetime.now() + retry_delay,
+                },
+                synchronize_session=False,
+            )
+        if commit:
+            db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in finish_outbox: {e}")
+        raise
+
+
+def prune_outbox(db: Session, older_than: timedelta):
+    """Delete sent and failed outbox rows queued more than `older_than` ago."""
+    # created_at is the database's CURRENT_TIMESTAMP, which is naive UTC.
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - older_than
+    try:
+        pruned = (
+            db.query(OutboxEntry)
+            .filter(OutboxEntry.status.in_(["sent", "failed"]), OutboxEntry.created_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return pruned
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in prune_outbox: {e}")
+        return 0
+
+
+def get_hackathons_by_ids(db: Session, hackathon_ids):
+    """Load hackathons as schemas, in the order of `hackathon_ids`."""
+    try:
+        rows = {h.id: h for h in db.query(HackathonDB).filter(HackathonDB.id.in_(hackathon_ids))}
+        return [Hackathon.model_validate(rows[i]) for i in hackathon_ids if i in rows]
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_hackathons_by_ids: {e}")
+        return []
+
+
+def get_source_watermark(db: Session, source: str):
+    """
+    Get the watermark for a source.
+    """
+    try:
+        return db.query(SourceWatermark).filter(SourceWatermark.source == source).first()
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_source_watermark: {e}")
+        return None
+
+
+def update_source_watermark(db: Session, source: str, seen_ids, full_sync: bool = False):
+    """
+    Record the IDs seen in a run. An incremental run adds to the known IDs; a full
+    resync replaces them, which also drops events that are no longer listed.
+    """
+    try:
+        watermark = db.query(SourceWatermark).filter(SourceWatermark.source == source).first()
+        if not watermark:
+            watermark = SourceWatermark(source=source, known_ids="")
+            db.add(watermark)
+
+        known_ids = set(seen_ids)
+        if not full_sync and watermark.known_ids:
+            known_ids.update(watermark.known_ids.split(","))
+        watermark.known_ids = ",".join(sorted(known_ids))
+        if full_sync:
+            watermark.last_full_sync = datetime.now()
+
+        db.commit()
+        db.refresh(watermark)
+        return watermark
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in update_source_watermark: {e}")
+        raise
+
+
 def get_upcoming(db: Session, from_date=None, to_date=None, sources=None):
     try:
         q = db.query(HackathonDB)
@@ -71,38 +373,113 @@ def get_upcoming(db: Session, from_date=None, to_date=None, sources=None):
         if to_date:
             q = q.filter(HackathonDB.end_date <= to_date)
         if sources:
-            q = q.filter(HackathonDB.source.in_(sources))
+            q = q.filter(HackathonDB.source.in_([normalize_source(s) for s in sources]))
         return q.order_by(HackathonDB.start_date).all()
     except SQLAlchemyError as e:
         logging.error(f"Database error in get_upcoming: {e}")
         raise
 
 
+def search_terms(keyword: str) -> list[str]:
+    return re.findall(r"\w+", keyword.lower())
+
+
 def search_hackathons(db: Session, keyword: str, limit: int = 3):
+    """
+    Full-text search over title, tags, location and source of hackathons that have not
+    ended. Every word of the keyword must match (as a prefix); results are ranked by
+    relevance, then by start date.
+    """
+    terms = search_terms(keyword)
+    if not terms:
+        return []
     try:
-        # Case insensitive search using ilike
-        search_term = f"%{keyword}%"
-        results = (
-            db.query(HackathonDB).filter(HackathonDB.tags.ilike(search_term)).limit(limit).all()
-        )
+        if db.get_bind().dialect.name == "postgresql":
+            query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+            vector = literal_column("hackathons.search_vector")
+            results = (
+                db.query(HackathonDB)
+                .filter(vector.op("@@")(query))
+                .filter(HackathonDB.end_date >= date.today())
+                .order_by(func.ts_rank(vector, query).desc(), HackathonDB.start_date)
+                .limit(limit)
+                .all()
+            )
+        else:
+            # Title matches weigh most, then tags; bm25() is lower for better matches.
+            statement = text(
+                "SELECT hackathons.* FROM hackathons_fts "
+                "JOIN hackathons ON hackathons.rowid = hackathons_fts.rowid "
+                "WHERE hackathons_fts MATCH :query AND hackathons.end_date >= :today "
+                "ORDER BY bm25(hackathons_fts, 10.0, 5.0, 1.0, 1.0), hackathons.start_date "
+                "LIMIT :limit"
+            )
+            results = (
+                db.query(HackathonDB)
+                .from_statement(statement)
+                .params(
+                    query=" ".join(f'"{term}"*' for term in terms),
+                    today=date.today().isoformat(),
+                    limit=limit,
+                )
+                .all()
+            )
         return results
     except SQLAlchemyError as e:
         logging.error(f"Database error in search_hackathons: {e}")
         return []
 
 
+def prune_search_index(db: Session):
+    """Drop hackathons that have ended from the SQLite full-text index."""
+    if db.get_bind().dialect.name != "sqlite":
+        return 0
+    try:
+        pruned = db.execute(
+            text(
+                "DELETE FROM hackathons_fts WHERE rowid IN "
+                "(SELECT rowid FROM hackathons WHERE end_date < :today)"
+            ),
+            {"today": date.today().isoformat()},
+        ).rowcount
+        db.commit()
+        return pruned
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in prune_search_index: {e}")
+        return 0
+
+
+def suggest_tags(db: Session, prefix: str, limit: int = 25):
+    """
+    Tags starting with `prefix`, most used first. The prefix becomes a range on the
+    hackathon_tags index, so this never scans the table.
+    """
+    prefix = normalize_tag(prefix)
+    try:
+        query = db.query(HackathonTag.tag).group_by(HackathonTag.tag)
+        if prefix:
+            query = query.filter(HackathonTag.tag >= prefix, HackathonTag.tag < prefix + "\uffff")
+        return [
+            tag for (tag,) in query.order_by(func.count().desc(), HackathonTag.tag).limit(limit)
+        ]
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in suggest_tags: {e}")
+        return []
+
+
 def get_hackathons_by_platform(db: Session, platform_name: str, limit: int = 3):
     """
     Get hackathons from a specific platform (source).
     Returns upcoming hackathons ordered by start date (soonest first).
     """
     try:
-        # Case insensitive search on the source column
+        # Sources are stored lowercased, so this is an equality on (source, start_date)
         # Filter for hackathons starting today or in the future
         # Order by start_date ascending (soonest first)
         results = (
             db.query(HackathonDB)
-            .filter(HackathonDB.source.ilike(f"%{platform_name}%"))
+            .filter(HackathonDB.source == normalize_source(platform_name))
             .filter(HackathonDB.start_date >= date.today())
             .order_by(HackathonDB.start_date.asc())
             .limit(limit)
@@ -202,6 +579,83 @@ def get_user_subscriptions(db: Session, user_id: int):
         return []
 
 
+def get_dm_channel_ids(db: Session, user_ids=None, limit: int | None = None):
+    """
+    Get cached DM channel IDs as {user_id: channel_id}, for `user_ids` or (most recently
+    used first, up to `limit`) for everyone.
+    """
+    try:
+        query = db.query(DMChannel.user_id, DMChannel.channel_id)
+        if user_ids is not None:
+            query = query.filter(DMChannel.user_id.in_(list(user_ids)))
+        else:
+            query = query.order_by(DMChannel.updated_at.desc()).limit(limit)
+        return dict(query.all())
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_dm_channel_ids: {e}")
+        return {}
+
+
+def save_dm_channel(db: Session, user_id: int, channel_id: int):
+    """
+    Remember the DM channel opened for a user.
+    """
+    try:
+        db.merge(DMChannel(user_id=user_id, channel_id=channel_id))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in save_dm_channel: {e}")
+
+
+def delete_dm_channel(db: Session, user_id: int):
+    """
+    Forget a user's DM channel, e.g. after Discord reports it as unknown.
+    """
+    try:
+        db.query(DMChannel).filter(DMChannel.user_id == user_id).delete()
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in delete_dm_channel: {e}")
+
+
+def get_bot_setting(db: Session, key: str):
+    """
+    Get a persisted bot setting, or None if it was never set.
+    """
+    try:
+        setting = db.get(BotSetting, key)
+        return setting.value if setting else None
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_bot_setting: {e}")
+        return None
+
+
+def set_bot_setting(db: Session, key: str, value: str):
+    """
+    Persist a bot setting.
+    """
+    try:
+        db.merge(BotSetting(key=key, value=value))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in set_bot_setting: {e}")
+        raise
+
+
+def get_all_guild_configs(db: Session):
+    """
+    Get every guild configuration.
+    """
+    try:
+        return db.query(GuildConfig).all()
+    except SQLAlchemyError as e:
+        logging.error(f"Database error in get_all_guild_configs: {e}")
+        raise
+
+
 def get_guild_config(db: Session, guild_id: str):
     """
     Get guild configuration.
@@ -243,6 +697,21 @@ def update_guild_preferences(
         raise
 
 
+def delete_guild_config(db: Session, guild_id: str):
+    """
+    Delete a guild's configuration, e.g. after the bot was removed from it.
+    Returns True if a configuration was deleted.
+    """
+    try:
+        deleted = db.query(GuildConfig).filter(GuildConfig.guild_id == guild_id).delete()
+        db.commit()
+        return bool(deleted)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logging.error(f"Database error in delete_guild_config: {e}")
+        raise
+
+
 def pause_notifications(db: Session, guild_id: str):
     """
     Pause notifications for a guild.
@@ -1,5 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -27,3 +29,34 @@ engine = create_engine(DATABASE_URL, **engine_kwargs)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+
+def async_database_url(url: str):
+    """The same database through an asyncio driver: asyncpg for PostgreSQL, aiosqlite for SQLite."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite"), {}
+    # asyncpg takes ssl and server settings as connect arguments, not psycopg2 URL options.
+    query = dict(url.query)
+    connect_args = {"server_settings": {"timezone": "utc", "statement_timeout": "60000"}}
+    if "sslmode" in query:
+        connect_args["ssl"] = query.pop("sslmode")
+    return url.set(drivername="postgresql+asyncpg", query=query), connect_args
+
+
+# Used by the slash-command handlers so a slow query never blocks the event loop.
+async_url, async_connect_args = async_database_url(DATABASE_URL)
+async_engine_kwargs = {"echo": False, "connect_args": async_connect_args}
+if is_sqlite:
+    # Opening a SQLite file is cheap, and pooled aiosqlite connections are tied to the
+    # event loop that opened them.
+    async_engine_kwargs["poolclass"] = NullPool
+else:
+    async_engine_kwargs["pool_pre_ping"] = True
+    async_engine_kwargs["pool_recycle"] = 300
+    async_engine_kwargs["pool_size"] = 10
+    async_engine_kwargs["max_overflow"] = 20
+
+async_engine = create_async_engine(async_url, **async_engine_kwargs)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
@@ -1,8 +1,95 @@
+from sqlalchemy import inspect, text
 from backend.db import Base, engine
+from backend.models import POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL, HackathonDB
+
+# Columns added after a table was first created; create_all() never alters existing tables.
+ADDED_COLUMNS = {
+    "hackathons": {"content_hash": "VARCHAR(64)"},
+}
+
+
+def upgrade_schema():
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def ensure_indexes():
+    """Create indexes added to the hackathons table after it was first created."""
+    for index in HackathonDB.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def normalize_sources():
+    """Lowercase sources stored before they were normalized on the way in."""
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE hackathons SET source = lower(trim(source)) "
+                "WHERE source <> lower(trim(source))"
+            )
+        )
+
+
+def ensure_search_index():
+    """Create the full-text index (and the end_date index it relies on) for an existing table."""
+    ensure_indexes()
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for statement in POSTGRES_SEARCH_DDL:
+                conn.execute(text(statement))
+    elif engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = 'hackathons_fts'")
+            ).first()
+            for statement in SQLITE_SEARCH_DDL:
+                conn.execute(text(statement))
+            if not exists:
+                conn.execute(
+                    text(
+                        "INSERT INTO hackathons_fts(rowid, title, tags, location, source) "
+                        "SELECT rowid, title, tags, location, source FROM hackathons "
+                        "WHERE end_date >= date('now')"
+                    )
+                )
+
+
+def backfill_hackathon_tags():
+    """Fill hackathon_tags from the comma-joined tags column when the table is first created."""
+    from backend.crud import normalize_tag
+    from backend.db import SessionLocal
+    from backend.models import HackathonDB, HackathonTag
+
+    db = SessionLocal()
+    try:
+        if db.query(HackathonTag).first() is not None:
+            return
+        rows = [
+            {"hackathon_id": hack_id, "tag": tag}
+            for hack_id, tags in db.query(HackathonDB.id, HackathonDB.tags)
+            for tag in {normalize_tag(t) for t in (tags or "").split(",") if t.strip()}
+        ]
+        if rows:
+            db.execute(HackathonTag.__table__.insert(), rows)
+            db.commit()
+    finally:
+        db.close()
 
 
 def create_all_tables():
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    normalize_sources()
+    ensure_search_index()
+    backfill_hackathon_tags()
 
 
 if __name__ == "__main__":
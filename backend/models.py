@@ -9,6 +9,9 @@ from sqlalchemy import (
     func,
     UniqueConstraint,
     Index,
+    ForeignKey,
+    DDL,
+    event,
 )
 from backend.db import Base
 
@@ -30,11 +33,120 @@ class HackathonDB(Base):
     prize_pool = Column(String, nullable=True)
     team_size = Column(String, nullable=True)
     eligibility = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+
+    # /platform: source = ? AND start_date >= ? ORDER BY start_date; /upcoming: a start_date
+    # range; search and pruning: end_date >= ?.
+    __table_args__ = (
+        Index("idx_hackathons_source_start_date", "source", "start_date"),
+        Index("idx_hackathons_start_date", "start_date"),
+        Index("idx_hackathons_end_date", "end_date"),
+    )
 
     def __repr__(self):
         return f"<Hackathon(title='{self.title}', start_date='{self.start_date}')>"
 
 
+# Full-text search over title, tags, location and source, maintained by the database itself.
+# PostgreSQL: a generated, weighted tsvector column with a GIN index; the planner combines it
+# with the end_date index so only matches that have not ended are ranked.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE hackathons ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', replace(coalesce(tags, ''), ',', ' ')), 'B')
+        || setweight(to_tsvector('simple', coalesce(location, '') || ' ' || source), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_hackathons_search ON hackathons USING GIN (search_vector)",
+]
+
+# SQLite: an FTS5 table keyed by the hackathons rowid. It only holds hackathons that had not
+# ended when written, and crud.prune_search_index() drops the ones that ended since, so
+# ranking never has to walk the whole history of past events.
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS hackathons_fts USING fts5(
+        title, tags, location, source, prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS hackathons_fts_insert AFTER INSERT ON hackathons
+    WHEN new.end_date >= date('now') BEGIN
+        INSERT INTO hackathons_fts(rowid, title, tags, location, source)
+        VALUES (new.rowid, new.title, new.tags, new.location, new.source);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS hackathons_fts_delete AFTER DELETE ON hackathons BEGIN
+        DELETE FROM hackathons_fts WHERE rowid = old.rowid;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS hackathons_fts_update AFTER UPDATE ON hackathons BEGIN
+        DELETE FROM hackathons_fts WHERE rowid = old.rowid;
+        INSERT INTO hackathons_fts(rowid, title, tags, location, source)
+        SELECT new.rowid, new.title, new.tags, new.location, new.source
+        WHERE new.end_date >= date('now');
+    END
+    """,
+]
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        HackathonDB.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(HackathonDB.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    HackathonDB.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS hackathons_fts").execute_if(dialect="sqlite"),
+)
+
+
+class HackathonTag(Base):
+    """One lowercased tag of a hackathon, so tag lookups use an index instead of ILIKE."""
+
+    __tablename__ = "hackathon_tags"
+
+    hackathon_id = Column(String, ForeignKey("hackathons.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(100), primary_key=True)
+
+    __table_args__ = (Index("idx_hackathon_tags_tag", "tag"),)
+
+    def __repr__(self):
+        return f"<HackathonTag(hackathon_id='{self.hackathon_id}', tag='{self.tag}')>"
+
+
+class OutboxEntry(Base):
+    """
+    A notification waiting to be delivered. Rows for "broadcast" are written together with
+    new hackathons and later expanded into one row per "guild:<id>" / "user:<id>" target.
+    """
+
+    __tablename__ = "outbox"
+
+    id = Column(Integer, primary_key=True)
+    target = Column(String, nullable=False)
+    hackathon_id = Column(String, ForeignKey("hackathons.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, sending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    claimed_by = Column(String, nullable=True)
+    claimed_until = Column(TIMESTAMP, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("target", "hackathon_id", name="unique_outbox_target_hackathon"),
+        Index("idx_outbox_status_target", "status", "target"),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEntry(target='{self.target}', hackathon_id='{self.hackathon_id}', status='{self.status}')>"
+
+
 class GuildConfig(Base):
     __tablename__ = "guild_configs"
 
@@ -48,6 +160,46 @@ class GuildConfig(Base):
         return f"<GuildConfig(guild_id='{self.guild_id}', channel_id='{self.channel_id}')>"
 
 
+class SourceWatermark(Base):
+    """IDs already stored for a source, used to stop paginating once only known events remain."""
+
+    __tablename__ = "source_watermarks"
+
+    source = Column(String, primary_key=True)
+    known_ids = Column(Text, default="", nullable=False)
+    last_full_sync = Column(TIMESTAMP, nullable=True)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<SourceWatermark(source='{self.source}', last_full_sync='{self.last_full_sync}')>"
+
+
+class DMChannel(Base):
+    """The DM channel Discord opened for a subscriber, so alerts can be sent without a lookup."""
+
+    __tablename__ = "dm_channels"
+
+    user_id = Column(BigInteger, primary_key=True)
+    channel_id = Column(BigInteger, nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DMChannel(user_id={self.user_id}, channel_id={self.channel_id})>"
+
+
+class BotSetting(Base):
+    """Small pieces of bot state that must survive restarts, e.g. the synced command tree hash."""
+
+    __tablename__ = "bot_settings"
+
+    key = Column(String, primary_key=True)
+    value = Column(Text, nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<BotSetting(key='{self.key}', value='{self.value}')>"
+
+
 class UserSubscription(Base):
     __tablename__ = "user_subscriptions"
 
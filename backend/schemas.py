@@ -1,8 +1,15 @@
+import hashlib
+import json
 from pydantic import BaseModel, field_validator
 from datetime import date
 from typing import List
 
 
+def normalize_source(source: str) -> str:
+    """Sources are stored lowercased, so a platform lookup is an indexable equality."""
+    return source.strip().lower()
+
+
 class Hackathon(BaseModel):
     id: str
     title: str
@@ -26,4 +33,14 @@ class Hackathon(BaseModel):
             return [tag.strip().lower() for tag in v.split(",") if tag.strip()]
         return v
 
+    @field_validator("source")
+    @classmethod
+    def lower_source(cls, v):
+        return normalize_source(v)
+
+    def content_hash(self) -> str:
+        """Stable hash of every stored field, used to skip rewriting unchanged rows."""
+        payload = json.dumps(self.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     model_config = {"from_attributes": True}
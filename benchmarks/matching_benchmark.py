@@ -0,0 +1,113 @@
+"""
+Benchmark notification matching against the loops it replaced.
+
+Usage:
+    python -m benchmarks.matching_benchmark [--subscriptions 100000] [--guilds 100000]
+                                            [--hackathons 50]
+
+DM subscribers: the Aho-Corasick theme index against the nested loop over every
+subscription. Themes are real-looking tags plus per-user variants, so the index holds
+thousands of distinct themes like a large deployment would.
+
+Guild fan-out: the bitmask FilterMatrix against matching each guild's filter in Python.
+Guilds pick from the platforms and themes offered by /setup, as real guilds do.
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from services.matching import FilterMatrix, GuildFilter, match_subscribers, prepare_hackathons
+
+TAGS = [
+    "ai", "machine learning", "web3", "blockchain", "fintech", "healthtech", "edtech", "iot",
+    "cloud", "devops", "gaming", "ar/vr", "open source", "security", "data science", "mobile",
+    "social good", "sustainability", "robotics", "design", "beginner friendly", "low/no code",
+]  # fmt: skip
+SETUP_PLATFORMS = ["devpost", "devfolio", "unstop", "mlh", "dorahacks", "hack2skill", "kaggle"]
+SETUP_THEMES = ["ai", "blockchain", "web", "mobile", "data", "cloud", "security", "gaming"]
+
+
+def naive_match(subscriptions, hackathons):
+    """The loop notify_subscribers used before the theme index."""
+    user_notifications = {}
+    for hackathon in hackathons:
+        hack_tags = [t.lower() for t in hackathon.tags] if hackathon.tags else []
+        for user_id, theme in subscriptions:
+            theme_lower = theme.lower()
+            is_match = False
+            for tag in hack_tags:
+                if theme_lower in tag:
+                    is_match = True
+                    break
+            if is_match:
+                if user_id not in user_notifications:
+                    user_notifications[user_id] = []
+                if hackathon not in user_notifications[user_id]:
+                    user_notifications[user_id].append(hackathon)
+    return user_notifications
+
+
+def synthetic_data(subscriptions: int, hackathons: int, seed: int = 11):
+    rng = random.Random(seed)
+    themes = TAGS + [f"{rng.choice(TAGS)} {rng.randint(0, 5000)}" for _ in range(5000)]
+    subs = [(rng.randint(1, subscriptions // 3), rng.choice(themes)) for _ in range(subscriptions)]
+    hacks = [
+        SimpleNamespace(id=i, tags=[t.title() for t in rng.sample(TAGS, rng.randint(1, 5))])
+        for i in range(hackathons)
+    ]
+    return subs, hacks
+
+
+def synthetic_guild_filters(guilds: int, seed: int = 13):
+    rng = random.Random(seed)
+
+    def pick(options):
+        return None if rng.random() < 0.4 else tuple(sorted(rng.sample(options, rng.randint(1, 3))))
+
+    return [GuildFilter(pick(SETUP_PLATFORMS), pick(SETUP_THEMES)) for _ in range(guilds)]
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscriptions", type=int, default=100_000)
+    parser.add_argument("--guilds", type=int, default=100_000)
+    parser.add_argument("--hackathons", type=int, default=50)
+    args = parser.parse_args()
+
+    subs, hacks = synthetic_data(args.subscriptions, args.hackathons)
+    expected, naive_seconds = timed(naive_match, subs, hacks)
+    result, index_seconds = timed(match_subscribers, subs, hacks)
+    assert result == expected
+
+    print(f"{args.subscriptions} subscriptions x {args.hackathons} hackathons")
+    print(f"  matched users: {len(result)}")
+    print(f"  nested loop:   {naive_seconds * 1000:8.1f} ms")
+    print(f"  theme index:   {index_seconds * 1000:8.1f} ms (including building the automaton)")
+    print(f"  speed-up:      {naive_seconds / index_seconds:8.1f}x")
+
+    # Every filter is matched individually here; in the bot, guilds first share equal filters.
+    filters = synthetic_guild_filters(args.guilds)
+    prepared = prepare_hackathons(
+        [SimpleNamespace(source=random.choice(SETUP_PLATFORMS), tags=h.tags) for h in hacks]
+    )
+    expected, loop_seconds = timed(lambda: [f.apply(prepared) for f in filters])
+    matrix_filters, build_seconds = timed(FilterMatrix, filters)
+    matrix, match_seconds = timed(matrix_filters.match, prepared)
+    assert [[prepared[i].hackathon for i in row.nonzero()[0]] for row in matrix] == expected
+
+    print(f"{args.guilds} guild filters x {args.hackathons} hackathons")
+    print(f"  per-guild loop: {loop_seconds * 1000:8.1f} ms")
+    print(f"  build masks:    {build_seconds * 1000:8.1f} ms (once per run)")
+    print(f"  bitmask match:  {match_seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
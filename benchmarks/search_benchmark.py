@@ -0,0 +1,106 @@
+"""
+Benchmark /search against a synthetic catalogue.
+
+Usage:
+    python -m benchmarks.search_benchmark [--rows 100000] [--repeat 200]
+
+Uses DATABASE_URL if set (point it at a scratch PostgreSQL database to measure the GIN
+index), otherwise a temporary SQLite file with FTS5. The hackathons table is emptied first.
+Nothing is ever deleted, so a catalogue of 100k events spans years: start dates are spread
+over the last eight years plus the next six months, and most events have ended.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='hackradar-bench-')}/bench.db"
+)
+
+from backend.crud import bulk_upsert_hackathons, search_hackathons  # noqa: E402
+from backend.db import SessionLocal  # noqa: E402
+from backend.init_db import create_all_tables  # noqa: E402
+from backend.models import HackathonDB, HackathonTag, OutboxEntry  # noqa: E402
+from backend.schemas import Hackathon  # noqa: E402
+
+WORDS = [
+    "global", "campus", "city", "open", "summer", "winter", "quantum", "green", "health",
+    "space", "civic", "retro", "neon", "hyper", "future", "nova", "pixel", "delta", "prime",
+    "spark", "forge", "sprint", "jam", "challenge", "buildathon", "summit", "week", "cup",
+]  # fmt: skip
+TAGS = [
+    "ai", "machine learning", "web3", "blockchain", "fintech", "healthtech", "edtech", "iot",
+    "cloud", "devops", "gaming", "ar/vr", "open source", "security", "data science", "mobile",
+    "social good", "sustainability", "robotics", "design", "beginner friendly", "low/no code",
+]  # fmt: skip
+LOCATIONS = ["Everywhere", "Bengaluru, India", "San Francisco, USA", "Berlin, Germany", "Lagos"]
+SOURCES = ["devpost", "devfolio", "unstop", "dorahacks", "mlh", "hack2skill"]
+QUERIES = ["ai", "quantum", "machine learning", "berlin", "devfolio", "neon sprint", "sec", "zzz"]
+
+
+def synthetic_hackathons(rows: int, seed: int = 7) -> list[Hackathon]:
+    rng = random.Random(seed)
+    today = date.today()
+    hacks = []
+    for i in range(rows):
+        start = today + timedelta(days=rng.randint(-8 * 365, 180))
+        hacks.append(
+            Hackathon(
+                id=f"bench-{i}",
+                title=" ".join(rng.sample(WORDS, 3)).title(),
+                start_date=start,
+                end_date=start + timedelta(days=rng.randint(1, 30)),
+                location=rng.choice(LOCATIONS),
+                url=f"https://example.com/{i}",
+                mode=rng.choice(["Online", "Offline"]),
+                status="open",
+                source=rng.choice(SOURCES),
+                tags=rng.sample(TAGS, rng.randint(1, 4)),
+            )
+        )
+    return hacks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    create_all_tables()
+    db = SessionLocal()
+    try:
+        db.query(OutboxEntry).delete()
+        db.query(HackathonTag).delete()
+        db.query(HackathonDB).delete()
+        db.commit()
+
+        started = time.perf_counter()
+        bulk_upsert_hackathons(db, synthetic_hackathons(args.rows), notify=False)
+        print(f"Loaded {args.rows} hackathons in {time.perf_counter() - started:.1f}s")
+        print(f"{db.get_bind().dialect.name}, limit {args.limit}, {args.repeat} runs per query")
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = search_hackathons(db, query, limit=args.limit)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            print(
+                f"{query!r:>20}: {len(results):>2} results, "
+                f"median {statistics.median(timings):.2f} ms, "
+                f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,39 @@
 import os
+import asyncio
+import hashlib
+import json
 import logging
-import random
+import zlib
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
 
 import discord
+import numpy as np
 from discord import app_commands
 from discord.ext import tasks
 from dotenv import load_dotenv
 
 from fetch_and_store import run as fetch_and_store_hackathons
-from backend.models import GuildConfig
-from backend.db import SessionLocal
+from backend import async_crud
+from backend.db import AsyncSessionLocal, SessionLocal
+from backend.schemas import Hackathon
 from backend.crud import (
-    search_hackathons,
-    get_hackathons_by_platform,
-    get_upcoming_hackathons,
-    subscribe_user,
     get_all_subscriptions,
-    get_user_subscriptions,
-    unsubscribe_user,
-    update_guild_preferences,
-    pause_notifications,
-    resume_notifications,
+    search_terms,
+)
+from services.delivery import DeliveryScheduler
+from services.dm_channels import DMChannelCache
+from services.guild_configs import GuildConfigCache
+from services.loop_monitor import LoopLagMonitor
+from services.outbox import OutboxWorker
+from services.query_cache import discovery_cache
+from services.single_flight import SingleFlight
+from services.render_cache import RenderCache
+from services.matching import (
+    FilterMatrix,
+    compile_guild_filter,
+    match_subscribers,
+    prepare_hackathons,
 )
 
 # 1. Configuration & Logging
@@ -35,37 +48,108 @@ logging.basicConfig(
 intents = discord.Intents.default()
 intents.guilds = True  # needed to see guilds and channels
 
+# The scrape is synchronous (HTTP + DB); it runs here so the gateway stays responsive.
+scrape_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrape")
+loop_monitor = LoopLagMonitor()
+delivery_scheduler = DeliveryScheduler()
+outbox_worker = OutboxWorker(delivery_scheduler)
+# The scrape's drain and the periodic retry drain never run at the same time.
+outbox_lock = asyncio.Lock()
+dm_channels = DMChannelCache()
+guild_configs = GuildConfigCache()
+discovery_flights = SingleFlight()
+
+HACKATHON_EMOJIS = ["🎉", "🚀", "💡", "🔥", "💻", "🏆", "🌟", "⚡", "🔮", "🛠️"]
+
+# Rendered hackathons are shared by every guild, DM and page turn that shows them.
+render_cache = RenderCache()
+
+# Discord's limits for one message; see pack_hackathon_cards().
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+EMBED_TITLE_LIMIT = 256
+EMBED_DESCRIPTION_LIMIT = 4096
+
+# How scheduled notifications with several hackathons are laid out: "packed" sends the
+# cards themselves, 10 per message; "paginated" sends a summary plus a paginator (always
+# two messages); "auto" packs whenever that fits in a single message.
+NOTIFICATION_LAYOUT = os.getenv("NOTIFICATION_LAYOUT", "auto")
+
+# bot_settings keys for the command tree sync.
+COMMAND_TREE_HASH_KEY = "command_tree_hash"
+GUILD_COMMANDS_CLEARED_KEY = "guild_commands_cleared"
+# Set to 1 to sync even if the definitions look unchanged (e.g. after editing them by hand).
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC") == "1"
+
+# /search results are ranked, so more than a handful are worth paging through.
+SEARCH_RESULT_LIMIT = 10
+
 # 2. Helper Functions (Basic)
 
 
-def format_hackathon_embed(hackathon):
-    """Create a Discord embed for a hackathon notification."""
-    emojis = ["🎉", "🚀", "💡", "🔥", "💻", "🏆", "🌟", "⚡", "🔮", "🛠️"]
-    random_emoji = random.choice(emojis)
-    msg = f"# {random_emoji} **{hackathon.title}**\n\n"
-    msg += "---\n"
-    msg += f"**Duration:** {hackathon.start_date.strftime('%B %d')} - {hackathon.end_date.strftime('%B %d, %Y')}\n"
-    msg += f"**Location:** {hackathon.location}\n"
-    msg += f"**Mode:** {hackathon.mode}\n"
-    msg += f"**Status:** {hackathon.status}\n"
+def hackathon_details(hackathon):
+    """The dates, place, prizes and rules of a hackathon as markdown lines."""
+    details = f"**Duration:** {hackathon.start_date.strftime('%B %d')} - {hackathon.end_date.strftime('%B %d, %Y')}\n"
+    details += f"**Location:** {hackathon.location}\n"
+    details += f"**Mode:** {hackathon.mode}\n"
+    details += f"**Status:** {hackathon.status}\n"
 
     if hackathon.prize_pool:
         if "\n" in hackathon.prize_pool or hackathon.prize_pool.startswith("-"):
-            msg += f"**Prizes:**\n{hackathon.prize_pool}\n"
+            details += f"**Prizes:**\n{hackathon.prize_pool}\n"
         else:
-            msg += f"**Prizes:** {hackathon.prize_pool}\n"
+            details += f"**Prizes:** {hackathon.prize_pool}\n"
 
     if hackathon.team_size:
-        msg += f"**Team Size:** {hackathon.team_size}\n"
+        details += f"**Team Size:** {hackathon.team_size}\n"
     if hackathon.eligibility:
-        msg += f"**Eligibility:** {hackathon.eligibility}\n"
+        details += f"**Eligibility:** {hackathon.eligibility}\n"
+    return details
+
+
+def render_fingerprint(hackathon):
+    """Every field a rendered hackathon shows; if one changes, the hackathon is rendered again."""
+    return (
+        hackathon.title,
+        hackathon.start_date,
+        hackathon.end_date,
+        hackathon.location,
+        hackathon.mode,
+        hackathon.status,
+        hackathon.source,
+        hackathon.url,
+        hackathon.banner_url,
+        hackathon.prize_pool,
+        hackathon.team_size,
+        hackathon.eligibility,
+    )
+
+
+def render_hackathon_message(hackathon):
+    # The emoji is derived from the ID rather than random so a cached render stays valid.
+    emoji = HACKATHON_EMOJIS[zlib.crc32(hackathon.id.encode()) % len(HACKATHON_EMOJIS)]
+    msg = f"# {emoji} **{hackathon.title}**\n\n"
+    msg += "---\n"
+    msg += hackathon_details(hackathon)
     msg += "---\n"
 
     embed = None
     if hackathon.banner_url:
         embed = discord.Embed()
         embed.set_image(url=hackathon.banner_url)
+    return msg, embed
+
 
+def format_hackathon_embed(hackathon):
+    """Create a Discord embed for a hackathon notification."""
+    msg, embed = render_cache.get(
+        ("message", hackathon.id),
+        render_fingerprint(hackathon),
+        lambda: render_hackathon_message(hackathon),
+    )
+
+    # Paginators stamp their page into the embed's footer and views belong to one message,
+    # so every caller gets its own embed copy and view.
     view = discord.ui.View()
 
     # Register button
@@ -76,7 +160,52 @@ def format_hackathon_embed(hackathon):
             )
         )
 
-    return msg, embed, view
+    return msg, embed.copy() if embed else None, view
+
+
+def render_hackathon_card(hackathon):
+    embed = discord.Embed(
+        title=hackathon.title[:EMBED_TITLE_LIMIT],
+        url=hackathon.url or None,
+        description=hackathon_details(hackathon)[:EMBED_DESCRIPTION_LIMIT],
+        color=discord.Color.green(),
+    )
+    if hackathon.banner_url:
+        embed.set_image(url=hackathon.banner_url)
+    embed.set_footer(text=hackathon.source)
+    return embed
+
+
+def hackathon_card(hackathon):
+    """A self-contained embed for a hackathon, so several fit in one message."""
+    card = render_cache.get(
+        ("card", hackathon.id),
+        render_fingerprint(hackathon),
+        lambda: render_hackathon_card(hackathon),
+    )
+    return card.copy()
+
+
+def pack_hackathon_cards(hackathons):
+    """
+    Split hackathon cards into as few messages as Discord allows: at most 10 embeds and
+    6000 embed characters per message. Cards keep their order, so filling each message
+    before starting the next gives the fewest messages.
+    """
+    messages = []
+    size = 0
+    for hackathon in hackathons:
+        card = hackathon_card(hackathon)
+        if (
+            not messages
+            or len(messages[-1]) == MAX_EMBEDS_PER_MESSAGE
+            or size + len(card) > MAX_EMBED_CHARS_PER_MESSAGE
+        ):
+            messages.append([])
+            size = 0
+        messages[-1].append((hackathon, card))
+        size += len(card)
+    return messages
 
 
 # 3. UI Classes (Views & Paginators)
@@ -146,42 +275,41 @@ class SetupView(discord.ui.View):
             )
             return
 
-        db = SessionLocal()
-        try:
-            update_guild_preferences(
-                db, self.guild_id, str(self.channel.id), self.platforms, self.themes
-            )
-
-            github_view = discord.ui.View()
-            github_view.add_item(
-                discord.ui.Button(
-                    label="⭐ Star on GitHub",
-                    url="https://github.com/Spartan-71/Discord-Hackathon-Bot",
-                    style=discord.ButtonStyle.link,
+        async with AsyncSessionLocal() as db:
+            try:
+                config = await async_crud.update_guild_preferences(
+                    db, self.guild_id, str(self.channel.id), self.platforms, self.themes
+                )
+                guild_configs.put(config)
+
+                github_view = discord.ui.View()
+                github_view.add_item(
+                    discord.ui.Button(
+                        label="⭐ Star on GitHub",
+                        url="https://github.com/Spartan-71/Discord-Hackathon-Bot",
+                        style=discord.ButtonStyle.link,
+                    )
                 )
-            )
 
-            success_embed = discord.Embed(
-                title="✅ Setup Complete!",
-                description=(
-                    "Your preferences have been saved successfully!\n\n"
-                    f"**Notification Channel:** {self.channel.mention}\n"
-                    f"**Platforms:** {', '.join(self.platforms) if self.platforms else 'All (Default)'}\n"
-                    f"**Themes:** {', '.join(self.themes) if self.themes else 'All (Default)'}\n\n"
-                    "🎉 You'll start receiving hackathon notifications soon.\n"
-                ),
-                color=discord.Color.green(),
-            )
+                success_embed = discord.Embed(
+                    title="✅ Setup Complete!",
+                    description=(
+                        "Your preferences have been saved successfully!\n\n"
+                        f"**Notification Channel:** {self.channel.mention}\n"
+                        f"**Platforms:** {', '.join(self.platforms) if self.platforms else 'All (Default)'}\n"
+                        f"**Themes:** {', '.join(self.themes) if self.themes else 'All (Default)'}\n\n"
+                        "🎉 You'll start receiving hackathon notifications soon.\n"
+                    ),
+                    color=discord.Color.green(),
+                )
 
-            await interaction.response.send_message(
-                embed=success_embed, view=github_view, ephemeral=True
-            )
-        except Exception as e:
-            await interaction.response.send_message(
-                f"❌ Error saving preferences: {str(e)}", ephemeral=True
-            )
-        finally:
-            db.close()
+                await interaction.response.send_message(
+                    embed=success_embed, view=github_view, ephemeral=True
+                )
+            except Exception as e:
+                await interaction.response.send_message(
+                    f"❌ Error saving preferences: {str(e)}", ephemeral=True
+                )
 
 
 class WelcomeView(discord.ui.View):
@@ -309,29 +437,58 @@ class HackathonPaginator(discord.ui.View):
 # 4. Notification Helper Functions
 
 
-async def send_standard_paginated_notification(channel, hackathons):
+async def cached_hackathons(key, query, *args):
+    """
+    Read-through discovery_cache for the discovery commands: runs `query(db, *args)` on a
+    miss. Keys are per day, since "upcoming" moves with the date.
+    """
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            rows = await query(db, *args)
+        # Cached results are shared between commands, so keep plain schemas, not ORM rows.
+        return [Hackathon.model_validate(row) for row in rows]
+
+    key = (*key, date.today())
+    # Concurrent misses for the same key (e.g. everyone running /upcoming 7 after an
+    # announcement) share one query.
+    return await discovery_cache.get(key, lambda: discovery_flights.do(key, load))
+
+
+async def send_message(channel, throttle=None, **kwargs):
+    """`channel.send`, first taking a rate-limit token when it is part of a fan-out."""
+    if throttle is not None:
+        await throttle()
+    return await channel.send(**kwargs)
+
+
+async def send_standard_paginated_notification(channel, hackathons, throttle=None):
     if len(hackathons) == 1:
         hackathon = hackathons[0]
         msg, embed, view = format_hackathon_embed(hackathon)
         if embed:
-            await channel.send(content=msg, embed=embed, view=view)
+            await send_message(channel, throttle, content=msg, embed=embed, view=view)
         else:
-            await channel.send(content=msg, view=view)
+            await send_message(channel, throttle, content=msg, view=view)
     else:
         paginator = HackathonPaginator(hackathons, context_type="manual")
         msg, embed, view_buttons = paginator.create_embed()
         paginator.add_action_buttons(view_buttons)
 
-        await channel.send(
+        await send_message(
+            channel,
+            throttle,
             content=f"📅 Found **{len(hackathons)}** hackathon(s). Use buttons to navigate:\n\n{msg}",
             embed=embed,
             view=paginator,
         )
 
 
-async def send_scheduled_notification_with_pagination(channel, hackathons):
+async def send_scheduled_notification_with_pagination(
+    channel, hackathons, title="🚀 New Hackathons Posted!", throttle=None
+):
     summary_embed = discord.Embed(
-        title="🚀 New Hackathons Posted!",
+        title=title,
         description=f"**{len(hackathons)}** new hackathon(s) have been posted. Click the buttons below to view details.",
         color=discord.Color.green(),
         timestamp=discord.utils.utcnow(),
@@ -352,175 +509,217 @@ async def send_scheduled_notification_with_pagination(channel, hackathons):
     msg, embed, view_buttons = paginator.create_embed()
     paginator.add_action_buttons(view_buttons)
 
-    await channel.send(embed=summary_embed)
-    await channel.send(
-        content=f"📖 **Detailed View** (1/{len(hackathons)}):", embed=embed, view=paginator
+    await send_message(channel, throttle, embed=summary_embed)
+    await send_message(
+        channel,
+        throttle,
+        content=f"📖 **Detailed View** (1/{len(hackathons)}):",
+        embed=embed,
+        view=paginator,
     )
 
 
-async def send_paginated_hackathons(channel, hackathons, context_type="scheduled"):
+async def send_packed_hackathons(channel, hackathons, packed=None, throttle=None):
+    """Send hackathon cards, up to 10 per message, each card with its own link button."""
+    packed = packed if packed is not None else pack_hackathon_cards(hackathons)
+    for number, cards in enumerate(packed):
+        view = discord.ui.View()
+        for hackathon, _card in cards:
+            if hackathon.url:
+                view.add_item(
+                    discord.ui.Button(
+                        label=f"🚀 {hackathon.title}"[:80],
+                        url=hackathon.url,
+                        style=discord.ButtonStyle.link,
+                    )
+                )
+        content = f"🚀 **{len(hackathons)}** new hackathon(s) posted!" if number == 0 else None
+        await send_message(
+            channel, throttle, content=content, embeds=[card for _h, card in cards], view=view
+        )
+
+
+async def send_paginated_hackathons(channel, hackathons, context_type="scheduled", throttle=None):
     if not hackathons:
         return
 
     if context_type == "scheduled" and len(hackathons) > 1:
-        await send_scheduled_notification_with_pagination(channel, hackathons)
+        packed = pack_hackathon_cards(hackathons) if NOTIFICATION_LAYOUT != "paginated" else []
+        if NOTIFICATION_LAYOUT == "packed" or len(packed) == 1:
+            await send_packed_hackathons(channel, hackathons, packed, throttle=throttle)
+        else:
+            await send_scheduled_notification_with_pagination(
+                channel, hackathons, throttle=throttle
+            )
     else:
-        await send_standard_paginated_notification(channel, hackathons)
+        await send_standard_paginated_notification(channel, hackathons, throttle=throttle)
 
 
-async def send_hackathon_notifications(bot, new_hackathons, target_channel=None):
+async def send_hackathon_notifications(bot, new_hackathons, target_channel):
     if not new_hackathons:
         return
 
-    if target_channel:
-        permissions = target_channel.permissions_for(target_channel.guild.me)
-        if not (permissions.send_messages and permissions.embed_links):
-            logging.warning(
-                f"Missing permissions in target channel {target_channel.id}. Skipping notifications."
-            )
-            return
+    permissions = target_channel.permissions_for(target_channel.guild.me)
+    if not (permissions.send_messages and permissions.embed_links):
+        logging.warning(
+            f"Missing permissions in target channel {target_channel.id}. Skipping notifications."
+        )
+        return
 
-        try:
-            await send_paginated_hackathons(
-                channel=target_channel, hackathons=new_hackathons, context_type="manual_fetch"
-            )
-            logging.info(
-                f"Sent {len(new_hackathons)} hackathons to channel {target_channel.id} with pagination"
-            )
-        except discord.Forbidden:
-            logging.error(
-                f"403 Forbidden when sending to channel {target_channel.id}. Check permissions."
-            )
-        except Exception as e:
-            logging.error(
-                f"Failed to send hackathon notifications to channel {target_channel.id}: {e}"
-            )
-    else:
-        db = SessionLocal()
-        try:
-            for guild in bot.guilds:
+    try:
+        await send_paginated_hackathons(
+            channel=target_channel, hackathons=new_hackathons, context_type="manual_fetch"
+        )
+        logging.info(
+            f"Sent {len(new_hackathons)} hackathons to channel {target_channel.id} with pagination"
+        )
+    except discord.Forbidden:
+        logging.error(
+            f"403 Forbidden when sending to channel {target_channel.id}. Check permissions."
+        )
+    except Exception as e:
+        logging.error(f"Failed to send hackathon notifications to channel {target_channel.id}: {e}")
+
+
+def guild_notification_channel(guild):
+    """Return (channel, GuildFilter) for a guild that receives notifications, else (None, None)."""
+    channel = None
+    guild_filter = compile_guild_filter(None, None)
+
+    try:
+        config = guild_configs.get(guild.id)
+        if config:
+            if config.notifications_paused == "true":
+                logging.info(f"Notifications are paused for guild {guild.id}. Skipping.")
+                return None, None
+
+            channel = guild.get_channel(int(config.channel_id))
+            if channel and not channel.permissions_for(guild.me).send_messages:
+                logging.warning(
+                    f"Configured channel {channel.id} in guild {guild.id} is not writable"
+                )
                 channel = None
-                platforms = ["all"]
-                themes = ["all"]
 
-                try:
-                    config = (
-                        db.query(GuildConfig).filter(GuildConfig.guild_id == str(guild.id)).first()
-                    )
-                    if config:
-                        if config.notifications_paused == "true":
-                            logging.info(
-                                f"Notifications are paused for guild {guild.id}. Skipping."
-                            )
-                            continue
-
-                        channel = guild.get_channel(int(config.channel_id))
-                        if channel and not channel.permissions_for(guild.me).send_messages:
-                            logging.warning(
-                                f"Configured channel {channel.id} in guild {guild.id} is not writable"
-                            )
-                            channel = None
-
-                        if config.subscribed_platforms:
-                            platforms = config.subscribed_platforms.split(",")
-                        if config.subscribed_themes:
-                            themes = config.subscribed_themes.split(",")
-                except Exception as e:
-                    logging.error(f"Error fetching guild config for {guild.id}: {e}")
+            guild_filter = compile_guild_filter(
+                config.subscribed_platforms, config.subscribed_themes
+            )
+    except Exception as e:
+        logging.error(f"Error fetching guild config for {guild.id}: {e}")
+
+    if channel is None:
+        logging.warning(f"No configured notification channel found for guild {guild.id}. Skipping.")
+        return None, None
+    return channel, guild_filter
+
+
+def plan_guild_notifications(bot, new_hackathons):
+    """
+    Match new hackathons against every guild's filter: [(guild, channel, hackathons)].
+    Reads guild_configs, which the caller must have loaded.
+    """
+    prepared = prepare_hackathons(new_hackathons)
+    # Guilds with identical preferences share one filter, so matching runs once per filter.
+    targets = {}
+    for guild in bot.guilds:
+        channel, guild_filter = guild_notification_channel(guild)
+        if channel is not None:
+            targets.setdefault(guild_filter, []).append((guild, channel))
+
+    matrix = FilterMatrix(targets).match(prepared)
+    plan = []
+    for row, guild_channels in zip(matrix, targets.values()):
+        filtered_hackathons = [new_hackathons[i] for i in np.flatnonzero(row)]
+        for guild, channel in guild_channels:
+            if filtered_hackathons:
+                plan.append((guild, channel, filtered_hackathons))
+            else:
+                logging.info(f"No matching hackathons for guild {guild.id} after filtering")
+    return plan
+
+
+async def deliver_to_guild(guild, channel, hackathons, throttle=None):
+    await send_paginated_hackathons(
+        channel=channel,
+        hackathons=hackathons,
+        context_type="scheduled",
+        throttle=throttle,
+    )
+    logging.info(f"Sent {len(hackathons)} hackathons to guild {guild.id} with pagination")
 
-                if channel is None:
-                    logging.warning(
-                        f"No configured notification channel found for guild {guild.id}. Skipping."
-                    )
-                    continue
-
-                filtered_hackathons = []
-                for hackathon in new_hackathons:
-                    if "all" not in platforms:
-                        if not any(p.lower() in hackathon.source.lower() for p in platforms):
-                            continue
-
-                    if "all" not in themes:
-                        hack_tags = [t.lower() for t in hackathon.tags] if hackathon.tags else []
-                        match = False
-                        for theme in themes:
-                            theme_lower = theme.lower()
-                            for tag in hack_tags:
-                                if theme_lower in tag:
-                                    match = True
-                                    break
-                            if match:
-                                break
-                        if not match:
-                            continue
-
-                    filtered_hackathons.append(hackathon)
-
-                if filtered_hackathons:
-                    try:
-                        await send_paginated_hackathons(
-                            channel=channel,
-                            hackathons=filtered_hackathons,
-                            context_type="scheduled",
-                        )
-                        logging.info(
-                            f"Sent {len(filtered_hackathons)} hackathons to guild {guild.id} with pagination"
-                        )
-                    except Exception as e:
-                        logging.error(
-                            f"Failed to send hackathon notifications in guild {guild.id}: {e}"
-                        )
-                else:
-                    logging.info(f"No matching hackathons for guild {guild.id} after filtering")
-        finally:
-            db.close()
-
-
-async def notify_subscribers(bot, new_hackathons):
-    if not new_hackathons:
-        return
 
+def load_and_match_subscribers(new_hackathons):
     db = SessionLocal()
     try:
         subscriptions = get_all_subscriptions(db)
-        if not subscriptions:
-            return
-
-        user_notifications = {}
-        for hackathon in new_hackathons:
-            hack_tags = [t.lower() for t in hackathon.tags] if hackathon.tags else []
-            for sub in subscriptions:
-                theme_lower = sub.theme.lower()
-                is_match = False
-                for tag in hack_tags:
-                    if theme_lower in tag:
-                        is_match = True
-                        break
-
-                if is_match:
-                    if sub.user_id not in user_notifications:
-                        user_notifications[sub.user_id] = []
-                    if hackathon not in user_notifications[sub.user_id]:
-                        user_notifications[sub.user_id].append(hackathon)
-
-        for user_id, hacks in user_notifications.items():
-            try:
-                user = await bot.fetch_user(user_id)
-                if user:
-                    for hack in hacks:
-                        msg, embed, view = format_hackathon_embed(hack)
-                        alert_msg = (
-                            f"🔔 **New Hackathon Alert!** (Matches your subscription)\n\n{msg}"
-                        )
-                        if embed:
-                            await user.send(content=alert_msg, embed=embed, view=view)
-                        else:
-                            await user.send(content=alert_msg, view=view)
-                        logging.info(f"Sent DM notification for '{hack.title}' to user {user_id}")
-            except Exception as e:
-                logging.error(f"Failed to DM user {user_id}: {e}")
     finally:
         db.close()
+    pairs = [(sub.user_id, sub.theme) for sub in subscriptions]
+    return match_subscribers(pairs, new_hackathons)
+
+
+async def match_subscriber_notifications(new_hackathons):
+    """Group new hackathons by subscribed user: {user_id: [hackathon, ...]}."""
+    # Loading and matching 100k subscriptions is CPU-bound; keep it off the event loop.
+    return await asyncio.to_thread(load_and_match_subscribers, new_hackathons)
+
+
+async def send_subscriber_alerts(bot, user_id, hacks, throttle=None):
+    channel = await dm_channels.channel_for(bot, user_id, throttle)
+    try:
+        await send_alerts_to_channel(channel, user_id, hacks, throttle)
+    except discord.NotFound:
+        # The cached DM channel is gone; open a new one and try once more.
+        await dm_channels.forget(user_id)
+        channel = await dm_channels.channel_for(bot, user_id, throttle)
+        await send_alerts_to_channel(channel, user_id, hacks, throttle)
+
+
+async def send_alerts_to_channel(channel, user_id, hacks, throttle=None):
+    # All of a user's matches go out together: one message, or a summary plus a paginator.
+    if len(hacks) > 1:
+        await send_scheduled_notification_with_pagination(
+            channel,
+            hacks,
+            title="🔔 New Hackathons Matching Your Subscriptions!",
+            throttle=throttle,
+        )
+    else:
+        msg, embed, view = format_hackathon_embed(hacks[0])
+        alert_msg = f"🔔 **New Hackathon Alert!** (Matches your subscription)\n\n{msg}"
+        if embed:
+            await send_message(channel, throttle, content=alert_msg, embed=embed, view=view)
+        else:
+            await send_message(channel, throttle, content=alert_msg, view=view)
+    logging.info(f"Sent {len(hacks)} hackathon alert(s) to user {user_id}")
+
+
+async def resolve_outbox_targets(bot, new_hackathons):
+    """Outbox targets for new hackathons: {"guild:<id>" or "user:<id>": [hackathon, ...]}."""
+    await guild_configs.ensure_loaded()
+    targets = {
+        f"guild:{guild.id}": hackathons
+        for guild, _channel, hackathons in plan_guild_notifications(bot, new_hackathons)
+    }
+    for user_id, hacks in (await match_subscriber_notifications(new_hackathons)).items():
+        targets[f"user:{user_id}"] = hacks
+    return targets
+
+
+async def send_outbox_target(bot, target, hackathons, throttle=None):
+    """Send an outbox target its hackathons; raising leaves them queued for a retry."""
+    kind, _, target_id = target.partition(":")
+    if kind == "user":
+        await send_subscriber_alerts(bot, int(target_id), hackathons, throttle)
+        return
+
+    guild = bot.get_guild(int(target_id))
+    if guild is None:
+        logging.warning(f"Bot is no longer in guild {target_id}. Dropping its notifications.")
+        return
+    await guild_configs.ensure_loaded()
+    channel, _filter = guild_notification_channel(guild)
+    if channel is not None:
+        await deliver_to_guild(guild, channel, hackathons, throttle)
 
 
 # 5. Main Client Class
@@ -530,10 +729,20 @@ class MyClient(discord.Client):
     def __init__(self, intents: discord.Intents):
         super().__init__(intents=intents)
         self.tree = app_commands.CommandTree(self)
+        self.commands_synced = False
 
     async def setup_hook(self):
+        loop_monitor.start()
+        try:
+            await guild_configs.load()
+            logging.info(f"Loaded {len(guild_configs)} guild configurations")
+        except Exception as e:
+            # The first fan-out or command that needs the configurations loads them instead.
+            logging.error(f"Failed to load guild configurations at startup: {e}")
         if not check_and_notify_hackathons.is_running():
             check_and_notify_hackathons.start(self)
+        if not drain_notification_outbox.is_running():
+            drain_notification_outbox.start(self)
 
     async def on_ready(self):
         logging.info(f"Logged on as {self.user}")
@@ -542,19 +751,64 @@ class MyClient(discord.Client):
             logging.info(f"- {guild.name} (ID: {guild.id}) members: {guild.member_count}")
             logging.info(f"  Channels: {len(guild.text_channels)}")
 
-        try:
-            for guild in self.guilds:
-                try:
-                    self.tree.clear_commands(guild=guild)
-                    await self.tree.sync(guild=guild)
-                except Exception as e:
-                    logging.error(f"Failed to clear guild commands for {guild.name}: {e}")
+        # on_ready also fires after every reconnect; the commands only need syncing once.
+        if not self.commands_synced:
+            try:
+                await self.clear_guild_commands()
+                await self.sync_commands()
+                self.commands_synced = True
+            except Exception as e:
+                logging.error(f"Error syncing commands: {e}")
+
+    def command_tree_hash(self):
+        """Hash of the command definitions exactly as they would be sent to Discord."""
+        payload = {
+            "application_id": self.application_id,
+            "commands": sorted(
+                (command.to_dict(self.tree) for command in self.tree.get_commands()),
+                key=lambda command: (command["name"], command.get("type", 1)),
+            ),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    async def sync_commands(self):
+        """Sync the global commands, unless these exact definitions were synced before."""
+        tree_hash = self.command_tree_hash()
+        async with AsyncSessionLocal() as db:
+            synced_hash = await async_crud.get_bot_setting(db, COMMAND_TREE_HASH_KEY)
+        if not FORCE_COMMAND_SYNC and synced_hash == tree_hash:
+            logging.info("Command definitions unchanged since the last sync; skipping sync")
+            return False
+
+        synced_global = await self.tree.sync()
+        async with AsyncSessionLocal() as db:
+            await async_crud.set_bot_setting(db, COMMAND_TREE_HASH_KEY, tree_hash)
+        logging.info(f"Synced {len(synced_global)} commands globally")
+        logging.info("Commands are now available in both servers and DMs!")
+        return True
+
+    async def clear_guild_commands(self):
+        """
+        One-off migration: commands used to be registered per guild as well, which showed
+        them twice. Clear those guild copies once; afterwards only global commands exist.
+        """
+        async with AsyncSessionLocal() as db:
+            if await async_crud.get_bot_setting(db, GUILD_COMMANDS_CLEARED_KEY):
+                return
+
+        failed = 0
+        for guild in self.guilds:
+            try:
+                self.tree.clear_commands(guild=guild)
+                await self.tree.sync(guild=guild)
+            except Exception as e:
+                failed += 1
+                logging.error(f"Failed to clear guild commands for {guild.name}: {e}")
 
-            synced_global = await self.tree.sync()
-            logging.info(f"Synced {len(synced_global)} commands globally")
-            logging.info("Commands are now available in both servers and DMs!")
-        except Exception as e:
-            logging.error(f"Error syncing commands: {e}")
+        if not failed:
+            async with AsyncSessionLocal() as db:
+                await async_crud.set_bot_setting(db, GUILD_COMMANDS_CLEARED_KEY, "true")
+            logging.info(f"Cleared guild commands in {len(self.guilds)} guilds")
 
     async def on_guild_join(self, guild):
         logging.info(f"Joined new guild: {guild.name} ({guild.id})")
@@ -606,10 +860,9 @@ class MyClient(discord.Client):
     async def on_guild_remove(self, guild):
         logging.info(f"Removed from guild: {guild.name} ({guild.id})")
         try:
-            db = SessionLocal()
-            db.query(GuildConfig).filter(GuildConfig.guild_id == str(guild.id)).delete()
-            db.commit()
-            db.close()
+            async with AsyncSessionLocal() as db:
+                await async_crud.delete_guild_config(db, str(guild.id))
+            guild_configs.remove(guild.id)
             logging.info(f"Deleted data for guild {guild.id} after removal")
         except Exception as e:
             logging.error(f"Failed to cleanup data for guild {guild.id}: {e}")
@@ -655,10 +908,14 @@ async def setup_error(interaction: discord.Interaction, error: app_commands.AppC
 @app_commands.describe(keyword="Search term (e.g.,AI, Blockchain, Data Science)")
 async def search(interaction: discord.Interaction, keyword: str):
     await interaction.response.defer(thinking=True)
-    db = SessionLocal()
     try:
         logging.info(f"Search query: {keyword} by user {interaction.user.id}")
-        results = search_hackathons(db, keyword)
+        results = await cached_hackathons(
+            ("search", tuple(search_terms(keyword)), SEARCH_RESULT_LIMIT),
+            async_crud.search_hackathons,
+            keyword,
+            SEARCH_RESULT_LIMIT,
+        )
     except Exception as e:
         logging.error(f"Error searching hackathons: {e}")
         await interaction.followup.send(
@@ -666,8 +923,6 @@ async def search(interaction: discord.Interaction, keyword: str):
             ephemeral=True,
         )
         return
-    finally:
-        db.close()
 
     if not results:
         await interaction.followup.send(f"❌ No hackathons found for **{keyword}**", ephemeral=True)
@@ -759,6 +1014,20 @@ async def platform_autocomplete(
     ]
 
 
+async def theme_autocomplete(
+    interaction: discord.Interaction,
+    current: str,
+) -> list[app_commands.Choice[str]]:
+    """Autocomplete for themes: the tags hackathons actually use, most common first."""
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await async_crud.suggest_tags(db, current)
+
+    tags = await discovery_cache.get(("themes", current.strip().lower()), load)
+    return [app_commands.Choice(name=tag, value=tag) for tag in tags]
+
+
 @client.tree.command(
     name="platform", description="Get upcoming hackathons from a specific platform"
 )
@@ -768,10 +1037,14 @@ async def platform_autocomplete(
 @app_commands.autocomplete(name=platform_autocomplete)
 async def platform(interaction: discord.Interaction, name: str, count: int = 3):
     await interaction.response.defer(thinking=True)
-    db = SessionLocal()
     try:
         logging.info(f"Platform query: {name} by user {interaction.user.id}")
-        results = get_hackathons_by_platform(db, name, count)
+        results = await cached_hackathons(
+            ("platform", name.strip().lower(), count),
+            async_crud.get_hackathons_by_platform,
+            name.strip(),
+            count,
+        )
     except Exception as e:
         logging.error(f"Error fetching hackathons by platform: {e}")
         await interaction.followup.send(
@@ -779,8 +1052,6 @@ async def platform(interaction: discord.Interaction, name: str, count: int = 3):
             ephemeral=True,
         )
         return
-    finally:
-        db.close()
 
     if not results:
         await interaction.followup.send(
@@ -857,9 +1128,10 @@ async def platform(interaction: discord.Interaction, name: str, count: int = 3):
 @app_commands.describe(days="Number of days to look ahead (default 7)")
 async def upcoming(interaction: discord.Interaction, days: int = 7):
     await interaction.response.defer(thinking=True)
-    db = SessionLocal()
     try:
-        results = get_upcoming_hackathons(db, days)
+        results = await cached_hackathons(
+            ("upcoming", days), async_crud.get_upcoming_hackathons, days
+        )
     except Exception as e:
         logging.error(f"Error fetching upcoming hackathons: {e}")
         await interaction.followup.send(
@@ -867,8 +1139,6 @@ async def upcoming(interaction: discord.Interaction, days: int = 7):
             ephemeral=True,
         )
         return
-    finally:
-        db.close()
 
     if not results:
         await interaction.followup.send(
@@ -942,22 +1212,21 @@ async def upcoming(interaction: discord.Interaction, days: int = 7):
 @app_commands.allowed_installs(guilds=True, users=True)
 @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
 @app_commands.describe(theme="The theme to subscribe to (e.g., AI, Blockchain)")
+@app_commands.autocomplete(theme=theme_autocomplete)
 async def subscribe(interaction: discord.Interaction, theme: str):
     await interaction.response.defer(ephemeral=True)
-    db = SessionLocal()
-    try:
-        sub, is_new = subscribe_user(db, interaction.user.id, theme)
-        if is_new:
-            await interaction.followup.send(
-                f"✅ You have successfully subscribed to **{theme}** updates!"
-            )
-        else:
-            await interaction.followup.send(f"ℹ️ You are already subscribed to **{theme}**.")
-    except Exception as e:
-        await interaction.followup.send(f"❌ Error subscribing: {str(e)}")
-        logging.error(f"Error in subscribe command: {e}")
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        try:
+            sub, is_new = await async_crud.subscribe_user(db, interaction.user.id, theme)
+            if is_new:
+                await interaction.followup.send(
+                    f"✅ You have successfully subscribed to **{theme}** updates!"
+                )
+            else:
+                await interaction.followup.send(f"ℹ️ You are already subscribed to **{theme}**.")
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error subscribing: {str(e)}")
+            logging.error(f"Error in subscribe command: {e}")
 
 
 @client.tree.command(
@@ -968,20 +1237,18 @@ async def subscribe(interaction: discord.Interaction, theme: str):
 @app_commands.describe(theme="The theme to unsubscribe from")
 async def unsubscribe(interaction: discord.Interaction, theme: str):
     await interaction.response.defer(ephemeral=True)
-    db = SessionLocal()
-    try:
-        removed = unsubscribe_user(db, interaction.user.id, theme)
-        if removed:
-            await interaction.followup.send(
-                f"✅ You have successfully unsubscribed from **{theme}** updates."
-            )
-        else:
-            await interaction.followup.send(f"ℹ️ You were not subscribed to **{theme}**.")
-    except Exception as e:
-        await interaction.followup.send(f"❌ Error unsubscribing: {str(e)}")
-        logging.error(f"Error in unsubscribe command: {e}")
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        try:
+            removed = await async_crud.unsubscribe_user(db, interaction.user.id, theme)
+            if removed:
+                await interaction.followup.send(
+                    f"✅ You have successfully unsubscribed from **{theme}** updates."
+                )
+            else:
+                await interaction.followup.send(f"ℹ️ You were not subscribed to **{theme}**.")
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error unsubscribing: {str(e)}")
+            logging.error(f"Error in unsubscribe command: {e}")
 
 
 @client.tree.command(name="subscriptions", description="View all your theme subscriptions")
@@ -989,60 +1256,57 @@ async def unsubscribe(interaction: discord.Interaction, theme: str):
 @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
 async def subscriptions(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
-    db = SessionLocal()
-    try:
-        user_subs = get_user_subscriptions(db, interaction.user.id)
-        if not user_subs:
+    async with AsyncSessionLocal() as db:
+        try:
+            user_subs = await async_crud.get_user_subscriptions(db, interaction.user.id)
+            if not user_subs:
+                embed = discord.Embed(
+                    title="📋 Your Subscriptions",
+                    description="You don't have any active subscriptions yet.\n\nUse `/subscribe [theme]` to start receiving notifications!",
+                    color=discord.Color.blue(),
+                )
+                await interaction.followup.send(embed=embed)
+                return
+
             embed = discord.Embed(
                 title="📋 Your Subscriptions",
-                description="You don't have any active subscriptions yet.\n\nUse `/subscribe [theme]` to start receiving notifications!",
-                color=discord.Color.blue(),
+                description=f"You're subscribed to **{len(user_subs)}** theme(s):",
+                color=discord.Color.green(),
             )
+            themes_list = "\n".join([f"• **{sub.theme}**" for sub in user_subs])
+            embed.add_field(name="Active Themes", value=themes_list, inline=False)
+            embed.set_footer(text="💡 Use /unsubscribe [theme] to remove a subscription")
             await interaction.followup.send(embed=embed)
-            return
-
-        embed = discord.Embed(
-            title="📋 Your Subscriptions",
-            description=f"You're subscribed to **{len(user_subs)}** theme(s):",
-            color=discord.Color.green(),
-        )
-        themes_list = "\n".join([f"• **{sub.theme}**" for sub in user_subs])
-        embed.add_field(name="Active Themes", value=themes_list, inline=False)
-        embed.set_footer(text="💡 Use /unsubscribe [theme] to remove a subscription")
-        await interaction.followup.send(embed=embed)
-    except Exception as e:
-        await interaction.followup.send(f"❌ Error fetching subscriptions: {str(e)}")
-        logging.error(f"Error in subscriptions command: {e}")
-    finally:
-        db.close()
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error fetching subscriptions: {str(e)}")
+            logging.error(f"Error in subscriptions command: {e}")
 
 
 @client.tree.command(name="pause", description="Pause hackathon notifications.")
 @app_commands.checks.has_permissions(administrator=True)
 async def pause(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
-    db = SessionLocal()
-    try:
-        success = pause_notifications(db, str(interaction.guild_id))
-        if success:
-            embed = discord.Embed(
-                title="⏸️ Notifications Paused",
-                description="Hackathon notifications have been paused for this server.\n\nUse `/resume` to start again.",
-                color=discord.Color.orange(),
-            )
-            await interaction.followup.send(embed=embed)
-        else:
-            embed = discord.Embed(
-                title="❌ Setup Required",
-                description="Please run `/setup` first to configure the bot.",
-                color=discord.Color.red(),
-            )
-            await interaction.followup.send(embed=embed)
-    except Exception as e:
-        await interaction.followup.send(f"❌ Error pausing notifications: {str(e)}")
-        logging.error(f"Error in pause command: {e}")
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        try:
+            success = await async_crud.pause_notifications(db, str(interaction.guild_id))
+            if success:
+                guild_configs.set_paused(interaction.guild_id, True)
+                embed = discord.Embed(
+                    title="⏸️ Notifications Paused",
+                    description="Hackathon notifications have been paused for this server.\n\nUse `/resume` to start again.",
+                    color=discord.Color.orange(),
+                )
+                await interaction.followup.send(embed=embed)
+            else:
+                embed = discord.Embed(
+                    title="❌ Setup Required",
+                    description="Please run `/setup` first to configure the bot.",
+                    color=discord.Color.red(),
+                )
+                await interaction.followup.send(embed=embed)
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error pausing notifications: {str(e)}")
+            logging.error(f"Error in pause command: {e}")
 
 
 @pause.error
@@ -1061,28 +1325,27 @@ async def pause_error(interaction: discord.Interaction, error: app_commands.AppC
 @app_commands.checks.has_permissions(administrator=True)
 async def resume(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
-    db = SessionLocal()
-    try:
-        success = resume_notifications(db, str(interaction.guild_id))
-        if success:
-            embed = discord.Embed(
-                title="▶️ Notifications Resumed",
-                description="Hackathon notifications have been resumed for this server.",
-                color=discord.Color.green(),
-            )
-            await interaction.followup.send(embed=embed)
-        else:
-            embed = discord.Embed(
-                title="❌ Setup Required",
-                description="Please run `/setup` first to configure the bot.",
-                color=discord.Color.red(),
-            )
-            await interaction.followup.send(embed=embed)
-    except Exception as e:
-        await interaction.followup.send(f"❌ Error resuming notifications: {str(e)}")
-        logging.error(f"Error in resume command: {e}")
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        try:
+            success = await async_crud.resume_notifications(db, str(interaction.guild_id))
+            if success:
+                guild_configs.set_paused(interaction.guild_id, False)
+                embed = discord.Embed(
+                    title="▶️ Notifications Resumed",
+                    description="Hackathon notifications have been resumed for this server.",
+                    color=discord.Color.green(),
+                )
+                await interaction.followup.send(embed=embed)
+            else:
+                embed = discord.Embed(
+                    title="❌ Setup Required",
+                    description="Please run `/setup` first to configure the bot.",
+                    color=discord.Color.red(),
+                )
+                await interaction.followup.send(embed=embed)
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error resuming notifications: {str(e)}")
+            logging.error(f"Error in resume command: {e}")
 
 
 @resume.error
@@ -1196,21 +1459,57 @@ async def check_and_notify_hackathons(bot: MyClient):
 
     try:
         logging.info("Starting hackathon fetch and notification check")
-        new_hackathons = fetch_and_store_hackathons()
+        logging.info(
+            f"Discovery cache: {discovery_cache.snapshot()}, "
+            f"coalesced queries: {discovery_flights.snapshot()}"
+        )
+        loop_monitor.reset()
+        loop = asyncio.get_running_loop()
+        new_hackathons = await loop.run_in_executor(scrape_executor, fetch_and_store_hackathons)
+        lag = loop_monitor.snapshot()
+        logging.info(
+            f"Event loop during scrape: max blocked {lag['max_ms']} ms, "
+            f"mean {lag['mean_ms']} ms over {lag['samples']} samples, {lag['stalls']} stalls"
+        )
 
-        if not new_hackathons:
+        if new_hackathons:
+            logging.info(f"Found {len(new_hackathons)} new hackathons, sending notifications")
+        else:
             logging.info("No new hackathons found")
-            return
 
-        logging.info(f"Found {len(new_hackathons)} new hackathons, sending notifications")
-        await send_hackathon_notifications(bot, new_hackathons)
-        await notify_subscribers(bot, new_hackathons)
-        logging.info("Completed hackathon notifications")
+        # The scrape queued new hackathons in the outbox; deliver them right away.
+        await drain_outbox(bot)
     except Exception as e:
         logging.error(f"Error in check_and_notify_hackathons task: {e}")
 
 
+async def drain_outbox(bot):
+    """Expand queued broadcasts and deliver everything the outbox has ready."""
+    async with outbox_lock:
+        dm_channels.reset_stats()
+        await outbox_worker.expand(lambda hacks: resolve_outbox_targets(bot, hacks))
+        report = await outbox_worker.deliver(
+            lambda target, hacks, throttle: send_outbox_target(bot, target, hacks, throttle)
+        )
+    if report.latencies:
+        logging.info(
+            f"Completed hackathon notifications: {report.snapshot()}, "
+            f"DM channels: {dm_channels.snapshot()}, renders: {render_cache.snapshot()}"
+        )
+    return report
+
+
+@tasks.loop(minutes=5)
+async def drain_notification_outbox(bot: MyClient):
+    # Retries failed sends and resumes anything a restart left behind, between scrapes.
+    try:
+        await drain_outbox(bot)
+    except Exception as e:
+        logging.error(f"Error in drain_notification_outbox task: {e}")
+
+
 @check_and_notify_hackathons.before_loop
+@drain_notification_outbox.before_loop
 async def before_check_and_notify():
     await client.wait_until_ready()
 
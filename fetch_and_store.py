@@ -1,102 +1,184 @@
+import argparse
+import asyncio
 import logging
+import os
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from adapters.devpost import fetch_devpost_hackathons
-from adapters.unstop import fetch_unstop_hackathons
-from adapters.dorahacks import fetch_dorahacks_hackathons
-from adapters.mlh import scrape_mlh_events
-from adapters.devfolio import fetch_devfolio_hackathons
-from adapters.hack2skill import fetch_hack2skill_hackathons
-
-from backend.db import SessionLocal, Base, engine
-from backend.crud import upsert_hackathon
-
-Base.metadata.create_all(bind=engine)
+from adapters import devfolio, devpost, dorahacks, hack2skill, mlh, unstop
+from adapters.cache import close_http_cache, http_cache
+from adapters.http import collect, create_client
+
+from backend.db import SessionLocal
+from backend.init_db import create_all_tables
+from backend.crud import (
+    bulk_upsert_hackathons,
+    get_source_watermark,
+    prune_search_index,
+    update_source_watermark,
+)
+from services.query_cache import discovery_cache
+
+create_all_tables()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
-
-def process_source(source_name, fetch_func):
-    """Process a single source with its own database session. Returns list of newly added hackathons."""
+# Each source exposes `async def fetch(client) -> AsyncIterator[Hackathon]`.
+SOURCES = [
+    ("MLH", mlh.fetch),
+    ("Devpost", devpost.fetch),
+    ("Unstop", unstop.fetch),
+    ("DoraHacks", dorahacks.fetch),
+    ("Devfolio", devfolio.fetch),
+    # ("Kaggle", fetch_kaggle_competitions)
+    ("Hack2Skill", hack2skill.fetch),
+]
+
+# Newest-first sources that accept `known_ids` and stop paginating once a page holds only
+# events stored by an earlier run.
+INCREMENTAL_SOURCES = {"Devpost", "Unstop", "DoraHacks"}
+# Incremental runs miss edits to older events, so a full pass is still made this often.
+FULL_RESYNC_INTERVAL = timedelta(hours=float(os.getenv("FULL_RESYNC_INTERVAL_HOURS", 24 * 7)))
+
+
+def load_known_ids(source_name, full_resync=False):
+    """Return the IDs known for an incremental run, or None if this run must be a full one."""
+    if full_resync or source_name not in INCREMENTAL_SOURCES:
+        return None
+
+    db = SessionLocal()
+    try:
+        watermark = get_source_watermark(db, source_name.lower())
+    finally:
+        db.close()
+
+    if (
+        watermark is None
+        or watermark.last_full_sync is None
+        or datetime.now() - watermark.last_full_sync > FULL_RESYNC_INTERVAL
+    ):
+        return None
+    return set(filter(None, watermark.known_ids.split(",")))
+
+
+def save_watermark(source_name, hackathons, full_sync):
+    db = SessionLocal()
+    try:
+        update_source_watermark(db, source_name.lower(), [h.id for h in hackathons], full_sync)
+    except SQLAlchemyError as e:
+        logging.error(f"Failed to update watermark for {source_name}: {e}")
+    finally:
+        db.close()
+
+
+def prune_search():
+    db = SessionLocal()
+    try:
+        pruned = prune_search_index(db)
+        if pruned:
+            logging.info(f"Removed {pruned} ended hackathons from the search index.")
+    finally:
+        db.close()
+
+
+def store_hackathons(source_name, hackathons):
+    """
+    Upsert one source's hackathons in a single transaction with its own database session.
+    Returns (new_hackathons, stored) where stored is False if the batch could not be saved.
+    """
     max_retries = 3
     retry_delay = 1
-    new_hackathons = []
 
     for attempt in range(max_retries):
         db = SessionLocal()
         try:
-            logging.info(f"Started fetching from {source_name}.")
-            hackathons = fetch_func()
-            logging.info(f"Fetched {len(hackathons)} hackathons from {source_name}.")
-
-            for h in hackathons:
-                try:
-                    logging.debug(f"Upserting hackathon: {h}")
-                    db_obj, is_new = upsert_hackathon(db, h)
-                    if is_new:
-                        new_hackathons.append(h)
-                except (SQLAlchemyError, OperationalError) as e:
-                    logging.error(f"Database error upserting hackathon from {source_name}: {e}")
-                    db.rollback()
-                    continue
-                except Exception as e:
-                    logging.error(f"Unexpected error upserting hackathon from {source_name}: {e}")
-                    db.rollback()
-                    continue
-
+            result = bulk_upsert_hackathons(db, hackathons)
+            new_hackathons = list({h.id: h for h in hackathons if h.id in result["new"]}.values())
             logging.info(
-                f"Completed upserting hackathons from {source_name}. {len(new_hackathons)} new hackathons added."
+                f"Completed upserting hackathons from {source_name}: {len(result['new'])} new, "
+                f"{len(result['changed'])} changed, {len(result['unchanged'])} unchanged."
             )
-            break  # Success, exit retry loop
-
+            if result["new"] or result["changed"]:
+                discovery_cache.invalidate()
+            return new_hackathons, True
         except (SQLAlchemyError, OperationalError) as e:
             logging.error(
-                f"Database error fetching from {source_name} (attempt {attempt + 1}/{max_retries}): {e}"
+                f"Database error storing {source_name} (attempt {attempt + 1}/{max_retries}): {e}"
             )
             if attempt < max_retries - 1:
                 time.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
             else:
                 logging.error(f"Failed to process {source_name} after {max_retries} attempts")
-        except Exception as e:
-            logging.error(f"Error fetching from {source_name}: {e}")
-            break  # Don't retry for non-database errors
         finally:
             db.close()
 
+    return [], False
+
+
+async def process_source(client, source_name, fetch_func, full_resync=False):
+    """Fetch a single source on the shared client and store it. Returns newly added hackathons."""
+    cache_name = source_name.lower()
+    try:
+        known_ids = await asyncio.to_thread(load_known_ids, source_name, full_resync)
+        full_sync = known_ids is None
+        # A resync of a newest-first source re-downloads every page so the watermark is
+        # rebuilt from all of them; other sources always send their validators.
+        resyncing = full_resync or (source_name in INCREMENTAL_SOURCES and full_sync)
+        http_cache(cache_name, conditional=not resyncing)
+        kwargs = {} if full_sync else {"known_ids": known_ids}
+
+        logging.info(
+            f"Started fetching from {source_name} ({'full' if full_sync else 'incremental'})."
+        )
+        hackathons = await collect(fetch_func, client, **kwargs)
+        logging.info(f"Fetched {len(hackathons)} hackathons from {source_name}.")
+    except Exception as e:
+        logging.error(f"Error fetching from {source_name}: {e}")
+        close_http_cache(cache_name, persist=False)
+        return []
+
+    # The database layer is synchronous; keep it off the loop that drives the other sources.
+    new_hackathons, stored = await asyncio.to_thread(store_hackathons, source_name, hackathons)
+
+    if stored and source_name in INCREMENTAL_SOURCES:
+        await asyncio.to_thread(save_watermark, source_name, hackathons, full_sync)
+
+    # Only remember validators once the rows behind them are saved; a later 304 skips them.
+    cache = close_http_cache(cache_name, persist=stored)
+    if cache is not None:
+        logging.info(f"{source_name} HTTP cache: {cache.hits} hits (304), {cache.misses} misses.")
     return new_hackathons
 
 
-def run():
+async def run_async(full_resync=False):
+    async with create_client() as client:
+        results = await asyncio.gather(
+            *(
+                process_source(client, name, fetch_func, full_resync)
+                for name, fetch_func in SOURCES
+            ),
+            return_exceptions=True,
+        )
+    await asyncio.to_thread(prune_search)
+
+    all_new_hackathons = []
+    for (name, _), result in zip(SOURCES, results):
+        if isinstance(result, BaseException):
+            logging.error(f"Task for {name} failed: {result}")
+            continue
+        all_new_hackathons.extend(result)
+    return all_new_hackathons
+
+
+def run(full_resync=False):
     """
     Run hackathon scraping and return list of newly added hackathons.
+    With full_resync, newest-first sources ignore their watermark and fetch every page.
     Returns: List of Hackathon objects that were newly added to the database.
     """
     logging.info("Starting hackathon scraping run.")
-    sources = [
-        ("MLH", scrape_mlh_events),
-        ("Devpost", fetch_devpost_hackathons),
-        ("Unstop", fetch_unstop_hackathons),
-        ("DoraHacks", fetch_dorahacks_hackathons),
-        ("Devfolio", fetch_devfolio_hackathons),
-        # ("Kaggle", fetch_kaggle_competitions)
-        ("Hack2Skill", fetch_hack2skill_hackathons),
-    ]
-    all_new_hackathons = []
-
-    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
-        future_to_source = {
-            executor.submit(process_source, name, fetch_func): name for name, fetch_func in sources
-        }
-        for future in as_completed(future_to_source):
-            name = future_to_source[future]
-            try:
-                new_hackathons = future.result()  # Get list of new hackathons from this source
-                all_new_hackathons.extend(new_hackathons)
-            except Exception as e:
-                logging.error(f"Thread for {name} failed: {e}")
-
+    all_new_hackathons = asyncio.run(run_async(full_resync))
     logging.info(
         f"Hackathon scraping run completed. {len(all_new_hackathons)} new hackathons added."
     )
@@ -104,4 +186,8 @@ def run():
 
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Fetch hackathons from all sources.")
+    parser.add_argument(
+        "--full", action="store_true", help="ignore watermarks and fetch every page"
+    )
+    run(full_resync=parser.parse_args().full)
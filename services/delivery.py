@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+# Discord allows 50 requests per second per bot; stay under it with room for commands.
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RATE = 40.0
+DEFAULT_TIMEOUT = 60.0
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class DeliveryReport:
+    """Per-target latency and failures of one fan-out."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.failures = {}
+        self.total = 0.0
+
+    def merge(self, other: "DeliveryReport"):
+        """Fold in the report of a later batch of the same fan-out."""
+        self.latencies.update(other.latencies)
+        self.failures.update(other.failures)
+        self.total += other.total
+
+    def snapshot(self):
+        latencies = sorted(self.latencies.values())
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1)
+
+        return {
+            "delivered": len(self.latencies) - len(self.failures),
+            "failed": len(self.failures),
+            "total_ms": round(self.total * 1000, 1),
+            "p50_ms": percentile(0.5) if latencies else 0.0,
+            "p95_ms": percentile(0.95) if latencies else 0.0,
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
+
+
+class DeliveryScheduler:
+    """
+    Runs message deliveries concurrently without tripping Discord's rate limits.
+
+    At most `concurrency` deliveries are in flight, their requests go out at no more than
+    `rate` per second (the global bucket), and deliveries to the same channel run one at a
+    time since they share a route bucket. discord.py still retries any 429 it receives. A delivery that
+    fails (e.g. 403 Forbidden) or exceeds `timeout` is recorded and does not stop the rest.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: float = DEFAULT_RATE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+
+    async def run(self, deliveries) -> DeliveryReport:
+        """
+        `deliveries` yields `(key, route, send)`: a label for the report (e.g. guild ID), the
+        route it uses (e.g. channel ID) and a coroutine function doing the sends. A delivery
+        may make several requests, so `send(throttle)` must `await throttle()` before each.
+        """
+        report = DeliveryReport()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate)
+        routes = {}
+
+        async def deliver(key, route, send: Callable[[Callable[[], Awaitable]], Awaitable]):
+            async with routes.setdefault(route, asyncio.Lock()), semaphore:
+                started = time.monotonic()
+                try:
+                    await asyncio.wait_for(send(bucket.acquire), self.timeout)
+                except asyncio.TimeoutError:
+                    report.failures[key] = f"timed out after {self.timeout:g}s"
+                    logging.error(f"Delivery to {key} timed out after {self.timeout:g}s")
+                except Exception as e:
+                    report.failures[key] = str(e)
+                    logging.error(f"Delivery to {key} failed: {e}")
+                finally:
+                    report.latencies[key] = time.monotonic() - started
+
+        started = time.monotonic()
+        await asyncio.gather(*(deliver(*delivery) for delivery in deliveries))
+        report.total = time.monotonic() - started
+        return report
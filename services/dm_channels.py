@@ -0,0 +1,98 @@
+import asyncio
+from collections import OrderedDict
+
+from backend.crud import delete_dm_channel, get_dm_channel_ids, save_dm_channel
+from backend.db import SessionLocal
+
+DM_CHANNEL_CACHE_SIZE = 50_000
+
+
+class DMChannelCache:
+    """
+    User ID -> DM channel ID, kept in an in-memory LRU in front of the `dm_channels` table.
+
+    Sending through a known channel ID is one request; `fetch_user()` followed by
+    `user.send()` is up to three (fetch the user, open the DM channel, send). The most
+    recently used channels are loaded in one query on first use; other users are looked up
+    individually, and only users never messaged before cost a fetch and `create_dm()`.
+    """
+
+    def __init__(self, maxsize: int = DM_CHANNEL_CACHE_SIZE, session_factory=SessionLocal):
+        self.maxsize = maxsize
+        self.session_factory = session_factory
+        self._channels = OrderedDict()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def snapshot(self):
+        return {"hits": self.hits, "db_hits": self.db_hits, "misses": self.misses}
+
+    def _remember(self, user_id, channel_id):
+        self._channels[user_id] = channel_id
+        self._channels.move_to_end(user_id)
+        while len(self._channels) > self.maxsize:
+            self._channels.popitem(last=False)
+
+    def _db(self, func, *args, **kwargs):
+        db = self.session_factory()
+        try:
+            return func(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    def _load(self):
+        for user_id, channel_id in self._db(get_dm_channel_ids, limit=self.maxsize).items():
+            self._channels.setdefault(user_id, channel_id)
+        self._loaded = True
+
+    async def lookup(self, user_id):
+        """The cached DM channel ID for a user, or None."""
+        if not self._loaded:
+            # Deliveries start together; only the first one loads the table.
+            async with self._load_lock:
+                if not self._loaded:
+                    await asyncio.to_thread(self._load)
+        channel_id = self._channels.get(user_id)
+        if channel_id is not None:
+            self._channels.move_to_end(user_id)
+            self.hits += 1
+            return channel_id
+        channel_id = (await asyncio.to_thread(self._db, get_dm_channel_ids, [user_id])).get(user_id)
+        if channel_id is not None:
+            self._remember(user_id, channel_id)
+            self.db_hits += 1
+        return channel_id
+
+    async def channel_for(self, bot, user_id, throttle=None):
+        """
+        A messageable DM channel for `user_id`, opening (and caching) one if needed.
+        `throttle`, if given, is awaited before each request this makes to Discord.
+        """
+        channel_id = await self.lookup(user_id)
+        if channel_id is not None:
+            return bot.get_partial_messageable(channel_id)
+
+        self.misses += 1
+        user = bot.get_user(user_id)
+        if user is None:
+            if throttle is not None:
+                await throttle()
+            user = await bot.fetch_user(user_id)
+        channel = user.dm_channel
+        if channel is None:
+            if throttle is not None:
+                await throttle()
+            channel = await user.create_dm()
+        self._remember(user_id, channel.id)
+        await asyncio.to_thread(self._db, save_dm_channel, user_id, channel.id)
+        return channel
+
+    async def forget(self, user_id):
+        self._channels.pop(user_id, None)
+        await asyncio.to_thread(self._db, delete_dm_channel, user_id)
@@ -0,0 +1,63 @@
+from backend import async_crud
+from backend.db import AsyncSessionLocal
+
+
+class CachedGuildConfig:
+    """The parts of a GuildConfig row the notification fan-out reads, detached from any session."""
+
+    __slots__ = (
+        "guild_id",
+        "channel_id",
+        "subscribed_platforms",
+        "subscribed_themes",
+        "notifications_paused",
+    )
+
+    def __init__(self, config):
+        for field in self.__slots__:
+            setattr(self, field, getattr(config, field))
+
+    def __repr__(self):
+        return f"<CachedGuildConfig(guild_id='{self.guild_id}', channel_id='{self.channel_id}')>"
+
+
+class GuildConfigCache:
+    """
+    Every guild's configuration, loaded with one query and kept in memory.
+
+    The bot is the only writer of guild_configs, so the cache stays consistent by writing
+    through: /setup, /pause, /resume and guild removal update it after their commit.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self._configs = {}
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._configs)
+
+    async def load(self):
+        async with self.session_factory() as db:
+            configs = await async_crud.get_all_guild_configs(db)
+        self._configs = {config.guild_id: CachedGuildConfig(config) for config in configs}
+        self.loaded = True
+
+    async def ensure_loaded(self):
+        if not self.loaded:
+            await self.load()
+
+    def get(self, guild_id) -> CachedGuildConfig | None:
+        return self._configs.get(str(guild_id))
+
+    def put(self, config):
+        """Write-through after a GuildConfig row was saved."""
+        self._configs[str(config.guild_id)] = CachedGuildConfig(config)
+
+    def set_paused(self, guild_id, paused: bool):
+        config = self._configs.get(str(guild_id))
+        if config is not None:
+            config.notifications_paused = "true" if paused else "false"
+
+    def remove(self, guild_id):
+        self._configs.pop(str(guild_id), None)
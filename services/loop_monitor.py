@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+
+
+class LoopLagMonitor:
+    """
+    Measures how long the asyncio event loop is blocked.
+
+    A heartbeat task sleeps for `interval` seconds and records how late it wakes up.
+    Any lateness is time during which the loop could not run other callbacks
+    (gateway heartbeats, slash commands, button clicks).
+    """
+
+    def __init__(self, interval: float = 0.25, warn_threshold: float = 0.5):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self._task = None
+        self.reset()
+
+    def reset(self):
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def record(self, lag: float):
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self.warn_threshold:
+            self.stalls += 1
+            logging.warning(f"Event loop was blocked for {lag * 1000:.0f} ms")
+
+    def snapshot(self) -> dict:
+        """Return the lag statistics gathered since the last reset, in milliseconds."""
+        mean = self.total_lag / self.samples if self.samples else 0.0
+        return {
+            "samples": self.samples,
+            "max_ms": round(self.max_lag * 1000, 1),
+            "mean_ms": round(mean * 1000, 1),
+            "stalls": self.stalls,
+        }
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.perf_counter() - started - self.interval))
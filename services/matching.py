@@ -0,0 +1,254 @@
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+
+class ThemeIndex:
+    """
+    Inverted index from subscribed themes to user IDs.
+
+    A theme matches a hackathon when it is a substring of one of its tags (case-insensitive),
+    the rule the DM notifications have always used. All themes are compiled into one
+    Aho-Corasick automaton, so each tag is scanned once no matter how many themes exist.
+    """
+
+    def __init__(self, subscriptions=()):
+        self._users = {}  # theme -> set of user IDs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # themes that end at each state, including via fail links
+        self._built = True
+        for user_id, theme in subscriptions:
+            self.add(user_id, theme)
+
+    def __len__(self):
+        return len(self._users)
+
+    def add(self, user_id, theme: str):
+        theme = theme.lower()
+        if theme not in self._users:
+            self._users[theme] = set()
+            self._insert(theme)
+        self._users[theme].add(user_id)
+
+    def _insert(self, theme: str):
+        state = 0
+        for char in theme:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(theme)
+        self._built = False
+
+    def _build(self):
+        # Breadth-first so a state's fail target is final before its children use it.
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while char not in self._goto[fail] and fail:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[nxt] = target
+                self._out[nxt] = self._out[nxt] + [
+                    theme for theme in self._out[self._fail[nxt]] if theme not in self._out[nxt]
+                ]
+        self._built = True
+
+    def themes_in(self, text: str) -> set[str]:
+        """Return every indexed theme that occurs in `text`."""
+        if not self._built:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(out[0])  # an empty theme occurs in any text
+        state = 0
+        for char in text.lower():
+            while char not in goto[state] and state:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def match(self, tags) -> set:
+        """Return the users subscribed to a theme contained in any of `tags`."""
+        users = set()
+        for tag in tags or []:
+            for theme in self.themes_in(tag):
+                users |= self._users[theme]
+        return users
+
+
+def match_subscribers(subscriptions, hackathons) -> dict:
+    """
+    Group new hackathons by subscribed user: {user_id: [hackathon, ...]}, in the order the
+    hackathons were given, each listed once per user. `subscriptions` are (user_id, theme).
+    """
+    index = ThemeIndex(subscriptions)
+    user_notifications = {}
+    for hackathon in hackathons:
+        for user_id in index.match(hackathon.tags):
+            hacks = user_notifications.setdefault(user_id, [])
+            if hackathon not in hacks:
+                hacks.append(hackathon)
+    return user_notifications
+
+
+class PreparedHackathon:
+    """A hackathon with its source and tags lowercased once per run, shared by every filter."""
+
+    __slots__ = ("hackathon", "source", "tags")
+
+    def __init__(self, hackathon):
+        self.hackathon = hackathon
+        self.source = hackathon.source.lower()
+        self.tags = tuple(t.lower() for t in hackathon.tags) if hackathon.tags else ()
+
+
+def prepare_hackathons(hackathons) -> list[PreparedHackathon]:
+    return [PreparedHackathon(hackathon) for hackathon in hackathons]
+
+
+class GuildFilter:
+    """
+    A guild's platform and theme preferences, parsed once. `None` means "all".
+
+    A hackathon passes when one subscribed platform is a substring of its source and one
+    subscribed theme is a substring of one of its tags. Filters are compared by value, so
+    guilds with the same preferences can share one result.
+    """
+
+    __slots__ = ("platforms", "themes")
+
+    def __init__(self, platforms=None, themes=None):
+        self.platforms = platforms
+        self.themes = themes
+
+    def __eq__(self, other):
+        return isinstance(other, GuildFilter) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"<GuildFilter(platforms={self.platforms}, themes={self.themes})>"
+
+    @property
+    def key(self):
+        return self.platforms, self.themes
+
+    def matches(self, hack: PreparedHackathon) -> bool:
+        if self.platforms is not None and not any(p in hack.source for p in self.platforms):
+            return False
+        if self.themes is not None and not any(
+            theme in tag for theme in self.themes for tag in hack.tags
+        ):
+            return False
+        return True
+
+    def apply(self, prepared: list[PreparedHackathon]) -> list:
+        return [hack.hackathon for hack in prepared if self.matches(hack)]
+
+
+def _parse_preference(value):
+    """'AI,Web' -> ('ai', 'web'); empty or containing 'all' -> None."""
+    if not value:
+        return None
+    items = value.split(",")
+    if "all" in items:
+        return None
+    return tuple(sorted({item.lower() for item in items}))
+
+
+@lru_cache(maxsize=1024)
+def compile_guild_filter(subscribed_platforms, subscribed_themes) -> GuildFilter:
+    """Compile the comma-joined preferences stored on a GuildConfig."""
+    return GuildFilter(
+        _parse_preference(subscribed_platforms), _parse_preference(subscribed_themes)
+    )
+
+
+class Vocabulary:
+    """Interns terms to bit positions so a set of terms becomes an integer bitmask."""
+
+    def __init__(self, terms=()):
+        self.bits = {}
+        for term in terms:
+            self.intern(term)
+
+    def __len__(self):
+        return len(self.bits)
+
+    def intern(self, term: str) -> int:
+        return self.bits.setdefault(term, len(self.bits))
+
+    def mask(self, terms) -> int:
+        mask = 0
+        for term in terms:
+            bit = self.bits.get(term)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def words(self, mask: int) -> list[int]:
+        """Split a mask into the uint64 words used by the NumPy arrays."""
+        return [(mask >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(max(1, -(-len(self) // 64)))]
+
+
+class FilterMatrix:
+    """
+    Guild filters encoded as bitmasks over interned platform and theme vocabularies.
+
+    Each hackathon is reduced to two masks: the subscribed platforms contained in its source
+    and the subscribed themes contained in its tags (found with one Aho-Corasick pass).
+    "Which filters want this hackathon" is then a vectorised AND over every filter's masks.
+    """
+
+    def __init__(self, filters):
+        self.filters = list(filters)
+        self.platforms = Vocabulary(p for f in self.filters for p in f.platforms or ())
+        self.themes = Vocabulary(t for f in self.filters for t in f.themes or ())
+        self._platform_index = ThemeIndex((term, term) for term in self.platforms.bits)
+        self._theme_index = ThemeIndex((term, term) for term in self.themes.bits)
+
+        # A filter without a platform (theme) restriction accepts every source (tag).
+        self.any_platform = np.array([f.platforms is None for f in self.filters], dtype=bool)
+        self.any_theme = np.array([f.themes is None for f in self.filters], dtype=bool)
+        self.platform_masks = self._masks(self.platforms, (f.platforms for f in self.filters))
+        self.theme_masks = self._masks(self.themes, (f.themes for f in self.filters))
+
+    @staticmethod
+    def _masks(vocabulary, term_sets):
+        rows = [vocabulary.words(vocabulary.mask(terms or ())) for terms in term_sets]
+        return np.array(rows, dtype=np.uint64).reshape(len(rows), len(vocabulary.words(0)))
+
+    def hackathon_masks(self, hack: PreparedHackathon):
+        platforms = self._platform_index.match([hack.source])
+        themes = self._theme_index.match(hack.tags)
+        return (
+            np.array(self.platforms.words(self.platforms.mask(platforms)), dtype=np.uint64),
+            np.array(self.themes.words(self.themes.mask(themes)), dtype=np.uint64),
+        )
+
+    def wanted_by(self, hack: PreparedHackathon) -> np.ndarray:
+        """Boolean array: which filters accept this hackathon."""
+        platform_mask, theme_mask = self.hackathon_masks(hack)
+        platform_ok = self.any_platform | (self.platform_masks & platform_mask).any(axis=1)
+        theme_ok = self.any_theme | (self.theme_masks & theme_mask).any(axis=1)
+        return platform_ok & theme_ok
+
+    def match(self, prepared: list[PreparedHackathon]) -> np.ndarray:
+        """Boolean matrix of shape (filters, hackathons)."""
+        if not prepared:
+            return np.zeros((len(self.filters), 0), dtype=bool)
+        return np.stack([self.wanted_by(hack) for hack in prepared], axis=1)
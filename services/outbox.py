@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+from backend.crud import (
+    BROADCAST,
+    claim_outbox,
+    enqueue_outbox,
+    finish_outbox,
+    get_hackathons_by_ids,
+    prune_outbox,
+)
+from backend.db import SessionLocal
+from services.delivery import DeliveryReport, DeliveryScheduler
+
+OUTBOX_LEASE = timedelta(minutes=15)
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = timedelta(minutes=5)
+OUTBOX_BATCH_SIZE = 1000
+OUTBOX_RETENTION = timedelta(days=7)
+
+
+class OutboxWorker:
+    """
+    Drains the notification outbox.
+
+    `expand()` turns each "broadcast" row (written with a new hackathon) into one row per
+    guild or user that wants it; `deliver()` sends each target its claimed hackathons through
+    the DeliveryScheduler, a batch of targets at a time until nothing is left to claim.
+    Rows are claimed under a lease, so several workers can drain the same outbox, and rows
+    left behind by a crash are picked up again once the lease expires. A failed delivery is
+    retried by a drain that starts at least `retry_delay` later, and sent or failed rows are
+    deleted once they are older than `retention`. A delivery is at-least-once: a crash
+    between sending and recording it repeats that send.
+    """
+
+    def __init__(
+        self,
+        scheduler: DeliveryScheduler,
+        lease: timedelta = OUTBOX_LEASE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        retry_delay: timedelta = OUTBOX_RETRY_DELAY,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        retention: timedelta = OUTBOX_RETENTION,
+        session_factory=SessionLocal,
+    ):
+        self.scheduler = scheduler
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.batch_size = batch_size
+        self.retention = retention
+        self.session_factory = session_factory
+
+    def _claim(self, broadcast):
+        db = self.session_factory()
+        try:
+            token, claimed = claim_outbox(
+                db, self.lease, broadcast=broadcast, limit=self.batch_size
+            )
+            hackathons = {target: get_hackathons_by_ids(db, ids) for target, ids in claimed.items()}
+            return token, hackathons
+        finally:
+            db.close()
+
+    def _finish(self, token, target, error=None):
+        db = self.session_factory()
+        try:
+            finish_outbox(db, token, target, error, self.max_attempts, retry_delay=self.retry_delay)
+        finally:
+            db.close()
+
+    def _prune(self):
+        db = self.session_factory()
+        try:
+            pruned = prune_outbox(db, self.retention)
+            if pruned:
+                logging.info(f"Removed {pruned} delivered outbox rows")
+        finally:
+            db.close()
+
+    def _record_targets(self, token, targets):
+        db = self.session_factory()
+        try:
+            for target, hackathon_ids in targets.items():
+                enqueue_outbox(db, target, hackathon_ids)
+            finish_outbox(db, token, BROADCAST, commit=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def expand(self, resolve_targets: Callable[[list], Awaitable[dict]]) -> int:
+        """
+        Expand claimed broadcasts. `resolve_targets(hackathons)` returns
+        {target: [hackathon, ...]}; the targets and the broadcast's completion are written
+        in one transaction. Returns the number of hackathons expanded.
+        """
+        token, claimed = await asyncio.to_thread(self._claim, True)
+        hackathons = claimed.get(BROADCAST, [])
+        if not hackathons:
+            return 0
+        try:
+            targets = await resolve_targets(hackathons)
+            ids = {target: [h.id for h in hacks] for target, hacks in targets.items()}
+            await asyncio.to_thread(self._record_targets, token, ids)
+        except Exception as e:
+            logging.error(f"Failed to expand outbox broadcasts: {e}")
+            await asyncio.to_thread(self._finish, token, BROADCAST, str(e))
+            return 0
+        logging.info(f"Expanded {len(hackathons)} new hackathons into {len(ids)} outbox targets")
+        return len(hackathons)
+
+    async def deliver(self, send: Callable[[str, list, Callable], Awaitable]) -> DeliveryReport:
+        """
+        Deliver every claimable target with `send(target, hackathons, throttle)` and record
+        the outcome; `send` awaits `throttle()` before each Discord request it makes.
+        """
+        report = DeliveryReport()
+        while True:
+            token, claimed = await asyncio.to_thread(self._claim, False)
+            if not claimed:
+                await asyncio.to_thread(self._prune)
+                return report
+            report.merge(await self._deliver_batch(token, claimed, send))
+
+    async def _deliver_batch(self, token, claimed, send) -> DeliveryReport:
+        def delivery(target, hackathons):
+            async def run(throttle):
+                try:
+                    if hackathons:
+                        await send(target, hackathons, throttle)
+                except (Exception, asyncio.CancelledError) as e:
+                    # Cancelled means the scheduler's timeout hit; release the rows for a retry.
+                    await asyncio.to_thread(self._finish, token, target, str(e) or repr(e))
+                    raise
+                await asyncio.to_thread(self._finish, token, target)
+
+            return run
+
+        return await self.scheduler.run(
+            (target, target, delivery(target, hackathons)) for target, hackathons in claimed.items()
+        )
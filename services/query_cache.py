@@ -0,0 +1,75 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# The catalogue only changes when a scrape stores new or changed rows, which invalidates
+# the cache; the TTL bounds staleness when a scrape runs in another process.
+DISCOVERY_CACHE_TTL = float(os.getenv("DISCOVERY_CACHE_TTL_SECONDS", 10 * 60))
+DISCOVERY_CACHE_SIZE = 1024
+
+
+class QueryCache:
+    """
+    Read-through TTL + LRU cache for query results.
+
+    `invalidate()` may be called from another thread (the scrape runs in an executor);
+    a load that was already running when the cache was invalidated is returned to its
+    caller but not cached. Empty results are not cached, since the crud functions also
+    return [] when the query failed.
+    """
+
+    def __init__(self, ttl: float = DISCOVERY_CACHE_TTL, maxsize: int = DISCOVERY_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, key, load):
+        """The cached value for `key`, or the result of `await load()`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = await load()
+
+        with self._lock:
+            if value and generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def snapshot(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+# /search, /platform and /upcoming results and theme suggestions; invalidated by
+# fetch_and_store.
+discovery_cache = QueryCache()
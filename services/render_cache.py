@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+RENDER_CACHE_SIZE = 4096
+
+
+class RenderCache:
+    """
+    LRU of rendered payloads keyed by hackathon ID.
+
+    Each entry remembers the fingerprint (the fields that went into it) it was rendered
+    from; when the row's content changes the fingerprint no longer matches and the payload
+    is rendered again. Rendering must therefore be deterministic for a given fingerprint.
+    """
+
+    def __init__(self, maxsize: int = RENDER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, fingerprint, render):
+        """The payload cached for `key`, or `render()` if it is missing or stale."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        payload = render()
+        self._entries[key] = (fingerprint, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return payload
+
+    def snapshot(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
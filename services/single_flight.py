@@ -0,0 +1,42 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in flight, later callers
+    with the same key wait for it and get its result (or exception) instead of starting
+    their own. The shared call is shielded, so one caller giving up does not cancel it for
+    the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key, func):
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here too, in case every caller gave up waiting
+
+    def snapshot(self):
+        total = self.calls + self.coalesced
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 3) if total else 0.0,
+        }
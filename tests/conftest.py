@@ -1,9 +1,13 @@
 import os
 import sys
+import tempfile
 from pathlib import Path
 
-# Ensure imports that initialize SQLAlchemy use an in-memory database during tests.
-os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+# Ensure imports that initialize SQLAlchemy use a throwaway database during tests. It is a
+# file rather than :memory: so the scrape's worker threads share the same tables.
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='hackradar-tests-')}/test.db"
+)
 # Ensure local packages (e.g., backend/) are importable during pytest collection.
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
@@ -28,3 +32,53 @@ def db_session():
         yield session
     finally:
         session.close()
+
+
+class FakeResponse:
+    def __init__(self, status: int, body=None, headers: dict | None = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            import aiohttp
+
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def json(self, content_type=None):
+        return self.body
+
+    async def text(self):
+        return str(self.body)
+
+
+class FakeClient:
+    """Stands in for the shared aiohttp session; `handler(url, params, headers)` answers."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append((url, dict(params or {}), dict(headers or {})))
+        return FakeResponse(*self.handler(url, params or {}, headers or {}))
+
+
+@pytest.fixture
+def fake_client():
+    return FakeClient
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    import adapters.cache
+
+    monkeypatch.setattr(adapters.cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(adapters.cache, "_http_caches", {})
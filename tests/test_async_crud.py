@@ -0,0 +1,83 @@
+import asyncio
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import bot
+from backend import async_crud
+from backend.crud import bulk_upsert_hackathons, get_guild_config, get_user_subscriptions
+from backend.db import AsyncSessionLocal, async_database_url
+from backend.init_db import ensure_search_index
+from backend.schemas import Hackathon
+
+
+def build_hack(hack_id: str, title: str, source: str = "devpost"):
+    return Hackathon(
+        id=hack_id,
+        title=title,
+        start_date=date.today() + timedelta(days=1),
+        end_date=date.today() + timedelta(days=3),
+        location="Online",
+        url=f"https://example.com/{hack_id}",
+        mode="Online",
+        status="Open",
+        source=source,
+        tags=["ai"],
+    )
+
+
+def test_async_database_url_picks_asyncio_drivers():
+    url, connect_args = async_database_url("postgresql://u:p@db:5432/hackradar?sslmode=require")
+    assert url.drivername == "postgresql+asyncpg"
+    assert "sslmode" not in url.query
+    assert connect_args["ssl"] == "require"
+    assert connect_args["server_settings"]["timezone"] == "utc"
+
+    url, connect_args = async_database_url("sqlite+pysqlite:///tmp/test.db")
+    assert url.drivername == "sqlite+aiosqlite"
+    assert connect_args == {}
+
+
+def test_async_twins_read_and_write(db_session):
+    ensure_search_index()
+    bulk_upsert_hackathons(
+        db_session,
+        [build_hack("a1", "Quantum Sprint"), build_hack("a2", "Green Jam", source="unstop")],
+        notify=False,
+    )
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            found = await async_crud.search_hackathons(db, "quant")
+            by_platform = await async_crud.get_hackathons_by_platform(db, "unstop")
+            upcoming = await async_crud.get_upcoming_hackathons(db, 7)
+            sub, is_new = await async_crud.subscribe_user(db, 5, "ai")
+            await async_crud.update_guild_preferences(db, "9", "99", ["devpost"], None)
+            paused = await async_crud.pause_notifications(db, "9")
+        return found, by_platform, upcoming, (sub.theme, is_new), paused
+
+    found, by_platform, upcoming, sub, paused = asyncio.run(run())
+
+    assert [h.id for h in found] == ["a1"]
+    assert [h.id for h in by_platform] == ["a2"]
+    assert {h.id for h in upcoming} == {"a1", "a2"}
+    assert sub == ("ai", True)
+    assert paused is True
+    config = get_guild_config(db_session, "9")
+    assert (config.channel_id, config.notifications_paused) == ("99", "true")
+    assert [s.theme for s in get_user_subscriptions(db_session, 5)] == ["ai"]
+
+
+def test_subscribe_command_uses_the_async_session(db_session):
+    interaction = SimpleNamespace(
+        user=SimpleNamespace(id=77),
+        response=SimpleNamespace(defer=AsyncMock()),
+        followup=SimpleNamespace(send=AsyncMock()),
+    )
+
+    asyncio.run(bot.subscribe.callback(interaction, "Web3"))
+
+    interaction.followup.send.assert_awaited_once_with(
+        "✅ You have successfully subscribed to **Web3** updates!"
+    )
+    assert [s.theme for s in get_user_subscriptions(db_session, 77)] == ["Web3"]
@@ -78,3 +78,54 @@ def test_paginator_button_state_and_footer():
         assert second_embed.footer.text == "📄 2/2"
 
     asyncio.run(run())
+
+
+def test_rendered_hackathons_are_cached_until_their_content_changes(monkeypatch):
+    import bot
+    from services.render_cache import RenderCache
+
+    monkeypatch.setattr(bot, "render_cache", RenderCache(maxsize=2))
+    hack = build_hack("render-1")
+
+    async def run():
+        first = format_hackathon_embed(hack)
+        second = format_hackathon_embed(hack)
+        return first, second
+
+    (first_msg, first_embed, _), (second_msg, second_embed, _) = asyncio.run(run())
+
+    assert first_msg == second_msg
+    assert first_embed is not second_embed  # each caller may set its own footer
+    assert bot.render_cache.snapshot()["hits"] == 1
+
+    changed = hack.model_copy(update={"title": "Renamed"})
+
+    async def run_changed():
+        return format_hackathon_embed(changed)
+
+    msg, _, _ = asyncio.run(run_changed())
+    assert "Renamed" in msg
+    assert bot.render_cache.snapshot()["misses"] == 2
+
+
+def test_paginator_footer_does_not_leak_into_cached_render():
+    hacks = [build_hack("leak-1"), build_hack("leak-2")]
+
+    async def run():
+        HackathonPaginator(hacks, context_type="manual").create_embed()
+        return format_hackathon_embed(hacks[0])
+
+    _, embed, _ = asyncio.run(run())
+
+    assert embed.footer.text is None
+
+
+def test_render_cache_evicts_least_recently_used():
+    from services.render_cache import RenderCache
+
+    cache = RenderCache(maxsize=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get(key, 1, lambda: key.upper())
+
+    assert cache.get("a", 1, lambda: "new") == "A"
+    assert cache.get("b", 1, lambda: "new") == "new"
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+import bot
+
+
+def fake_client(tree_hash="abc", guilds=()):
+    return SimpleNamespace(
+        command_tree_hash=lambda: tree_hash,
+        guilds=list(guilds),
+        tree=SimpleNamespace(sync=AsyncMock(return_value=[object()]), clear_commands=MagicMock()),
+    )
+
+
+def test_commands_sync_only_when_definitions_change():
+    client = fake_client()
+
+    assert asyncio.run(bot.MyClient.sync_commands(client)) is True
+    assert asyncio.run(bot.MyClient.sync_commands(client)) is False
+    client.tree.sync.assert_awaited_once_with()
+
+    changed = fake_client(tree_hash="def")
+    assert asyncio.run(bot.MyClient.sync_commands(changed)) is True
+
+
+def test_command_tree_hash_tracks_definitions():
+    client = bot.MyClient(intents=discord.Intents.default())
+
+    @client.tree.command(name="ping", description="Ping")
+    async def ping(interaction: discord.Interaction):
+        pass
+
+    before = client.command_tree_hash()
+    assert client.command_tree_hash() == before
+
+    ping.description = "Pong"
+    assert client.command_tree_hash() != before
+
+
+def test_guild_commands_are_cleared_once():
+    guilds = [SimpleNamespace(id=1, name="one"), SimpleNamespace(id=2, name="two")]
+    client = fake_client(guilds=guilds)
+    client.tree.sync.side_effect = [RuntimeError("rate limited"), [], [], []]
+
+    asyncio.run(bot.MyClient.clear_guild_commands(client))  # one guild failed: try again
+    asyncio.run(bot.MyClient.clear_guild_commands(client))
+    asyncio.run(bot.MyClient.clear_guild_commands(client))
+
+    assert client.tree.sync.await_count == 4
+
+
+def test_command_sync_state_uses_the_async_engine():
+    from sqlalchemy import event
+
+    from backend.db import engine
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        client = fake_client()
+        asyncio.run(bot.MyClient.clear_guild_commands(client))
+        asyncio.run(bot.MyClient.sync_commands(client))
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert statements == []
@@ -1,11 +1,13 @@
 from datetime import date, timedelta
 
 from backend.crud import (
+    bulk_upsert_hackathons,
     get_all_subscriptions,
     get_guild_config,
     get_hackathons_by_platform,
     get_upcoming_hackathons,
     search_hackathons,
+    suggest_tags,
     pause_notifications,
     resume_notifications,
     subscribe_user,
@@ -13,7 +15,7 @@ from backend.crud import (
     update_guild_preferences,
     upsert_hackathon,
 )
-from backend.models import HackathonDB
+from backend.models import HackathonDB, HackathonTag
 from backend.schemas import Hackathon
 
 
@@ -60,12 +62,57 @@ def test_upsert_hackathon_create_and_update(db_session):
     assert updated.tags == "web,cloud"
 
 
+def test_bulk_upsert_reports_new_changed_and_unchanged(db_session, monkeypatch):
+    monkeypatch.setattr("backend.crud.UPSERT_BATCH_SIZE", 2)
+    upsert_hackathon(db_session, build_hackathon("hack-1", title="Original"))
+    upsert_hackathon(db_session, build_hackathon("hack-0"))
+
+    result = bulk_upsert_hackathons(
+        db_session,
+        [
+            build_hackathon("hack-0"),
+            build_hackathon("hack-1", title="Updated", tags=["web"]),
+            build_hackathon("hack-2"),
+            build_hackathon("hack-3", title="First copy"),
+            build_hackathon("hack-3", title="Second copy"),
+        ],
+    )
+
+    assert result == {"new": {"hack-2", "hack-3"}, "changed": {"hack-1"}, "unchanged": {"hack-0"}}
+    db_session.expire_all()
+    updated = db_session.get(HackathonDB, "hack-1")
+    assert (updated.title, updated.tags) == ("Updated", "web")
+    assert db_session.get(HackathonDB, "hack-3").title == "Second copy"
+    assert bulk_upsert_hackathons(db_session, [build_hackathon("hack-2")])["unchanged"] == {
+        "hack-2"
+    }
+
+
+def test_unchanged_rows_are_not_rewritten(db_session):
+    created, _ = upsert_hackathon(db_session, build_hackathon("hack-1"))
+    assert created.content_hash == build_hackathon("hack-1").content_hash()
+
+    db_session.query(HackathonDB).filter_by(id="hack-1").update({"location": "Tampered"})
+    db_session.commit()
+
+    bulk_upsert_hackathons(db_session, [build_hackathon("hack-1")])
+    db_session.expire_all()
+    assert db_session.get(HackathonDB, "hack-1").location == "Tampered"
+
+    bulk_upsert_hackathons(db_session, [build_hackathon("hack-1", title="Renamed")])
+    db_session.expire_all()
+    assert db_session.get(HackathonDB, "hack-1").location == "Online"
+
+
 def test_search_and_platform_and_upcoming_filters(db_session):
     upsert_hackathon(
         db_session, build_hackathon("hack-1", source="Devpost", tags=["ai", "web"], start_offset=1)
     )
     upsert_hackathon(
-        db_session, build_hackathon("hack-2", source="Devfolio", tags=["data"], start_offset=2)
+        db_session,
+        build_hackathon(
+            "hack-2", title="Data Sprint", source="Devfolio", tags=["data"], start_offset=2
+        ),
     )
     upsert_hackathon(
         db_session,
@@ -133,3 +180,123 @@ def test_hackathon_rows_are_persisted(db_session):
     row = db_session.query(HackathonDB).filter(HackathonDB.id == "hack-9").first()
     assert row is not None
     assert row.source == "devpost"
+
+
+def test_upgrade_schema_adds_content_hash_to_existing_table():
+    from sqlalchemy import inspect, text
+
+    from backend.db import engine
+    from backend.init_db import upgrade_schema
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE hackathons"))
+        conn.execute(text("CREATE TABLE hackathons (id VARCHAR PRIMARY KEY, title VARCHAR)"))
+
+    upgrade_schema()
+
+    columns = {column["name"] for column in inspect(engine).get_columns("hackathons")}
+    assert "content_hash" in columns
+
+
+def test_tag_rows_follow_upserts(db_session):
+    upsert_hackathon(db_session, build_hackathon("hack-1", tags=["AI", "Web"]))
+    bulk_upsert_hackathons(db_session, [build_hackathon("hack-2", tags=["Blockchain", " ai"])])
+
+    tags = db_session.query(HackathonTag.hackathon_id).filter_by(tag="ai").all()
+    assert sorted(tags) == [("hack-1",), ("hack-2",)]
+
+    bulk_upsert_hackathons(db_session, [build_hackathon("hack-2", tags=["Blockchain"])])
+    tags = db_session.query(HackathonTag.tag).filter_by(hackathon_id="hack-2").all()
+    assert tags == [("blockchain",)]
+
+
+def test_tag_suggestions_match_prefixes_most_used_first(db_session):
+    bulk_upsert_hackathons(
+        db_session,
+        [
+            build_hackathon("hack-1", tags=["Web3", "AI"]),
+            build_hackathon("hack-2", tags=["web", "Web3"]),
+            build_hackathon("hack-3", tags=["Webinar"]),
+        ],
+    )
+
+    assert suggest_tags(db_session, " WEB") == ["web3", "web", "webinar"]
+    assert suggest_tags(db_session, "web3") == ["web3"]
+    assert suggest_tags(db_session, "", limit=1) == ["web3"]
+    assert suggest_tags(db_session, "zz") == []
+
+
+def test_full_text_search_ranks_and_tracks_updates(db_session):
+    bulk_upsert_hackathons(
+        db_session,
+        [
+            build_hackathon("late", title="Global Hack", tags=["ai"], start_offset=9),
+            build_hackathon("soon", title="Campus Jam", tags=["ai"], start_offset=2),
+            build_hackathon("title", title="AI Builders", tags=["web"], start_offset=20),
+            build_hackathon("chain", title="Ledger Week", tags=["blockchain"]),
+        ],
+    )
+
+    results = search_hackathons(db_session, "AI", limit=5)
+    assert [r.id for r in results] == ["title", "soon", "late"]
+    assert [r.id for r in search_hackathons(db_session, "ledg week")] == ["chain"]
+    assert search_hackathons(db_session, "chain") == []  # whole words, not substrings
+    assert search_hackathons(db_session, '"*') == []
+
+    bulk_upsert_hackathons(
+        db_session, [build_hackathon("chain", title="Ledger Week", tags=["ai"], start_offset=30)]
+    )
+    assert [r.id for r in search_hackathons(db_session, "ai", limit=5)][-1] == "chain"
+
+
+def test_backfill_hackathon_tags_from_tags_column(db_session):
+    from backend.init_db import backfill_hackathon_tags
+
+    upsert_hackathon(db_session, build_hackathon("hack-1", tags=["AI", "Web"]))
+    db_session.query(HackathonTag).delete()
+    db_session.commit()
+
+    backfill_hackathon_tags()
+
+    assert {t for (t,) in db_session.query(HackathonTag.tag)} == {"ai", "web"}
+
+
+def test_ensure_search_index_rebuilds_for_existing_rows(db_session):
+    from sqlalchemy import text
+
+    from backend.init_db import ensure_search_index
+
+    upsert_hackathon(db_session, build_hackathon("hack-1", title="Quantum Jam"))
+    db_session.execute(text("DROP TABLE hackathons_fts"))
+    db_session.commit()
+
+    ensure_search_index()
+
+    assert [r.id for r in search_hackathons(db_session, "quantum")] == ["hack-1"]
+
+
+def test_ended_hackathons_leave_the_search_index(db_session):
+    from sqlalchemy import text
+
+    from backend.crud import prune_search_index
+
+    bulk_upsert_hackathons(
+        db_session,
+        [
+            build_hackathon("live", title="Quantum Jam"),
+            build_hackathon("past", title="Quantum Cup", start_offset=-9, end_offset=-2),
+        ],
+    )
+    assert [r.id for r in search_hackathons(db_session, "quantum", limit=5)] == ["live"]
+
+    # Simulate "past" having been indexed while it was still running.
+    db_session.execute(
+        text(
+            "INSERT INTO hackathons_fts(rowid, title, tags, location, source) "
+            "SELECT rowid, title, tags, location, source FROM hackathons WHERE id = 'past'"
+        )
+    )
+    db_session.commit()
+    assert [r.id for r in search_hackathons(db_session, "quantum", limit=5)] == ["live"]
+    assert prune_search_index(db_session) == 1
+    assert prune_search_index(db_session) == 0
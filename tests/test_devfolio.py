@@ -0,0 +1,63 @@
+import asyncio
+from datetime import date, timedelta
+
+from adapters import devfolio
+from adapters.cache import JsonCache
+from adapters.http import collect
+
+
+def listing(slug: str, **extra):
+    start = date.today() + timedelta(days=5)
+    return {
+        "name": f"Hack {slug}",
+        "slug": slug,
+        "starts_at": f"{start.isoformat()}T00:00:00Z",
+        "ends_at": f"{(start + timedelta(days=2)).isoformat()}T00:00:00Z",
+        **extra,
+    }
+
+
+def fake_api(pages: list[list[dict]], prize_calls: list[str]):
+    def handler(url, params, headers):
+        if url.endswith("/prizes"):
+            prize_calls.append(url.split("/")[-2])
+            return 200, [{"name": "Winner", "amount": "500"}]
+        page = params["page"]
+        return 200, {"result": pages[page - 1] if page <= len(pages) else []}
+
+    return handler
+
+
+def run_fetch(client):
+    return asyncio.run(collect(devfolio.fetch, client))
+
+
+def test_prizes_are_fetched_once_per_unchanged_slug(monkeypatch, tmp_path, fake_client):
+    prize_calls = []
+    pages = [[listing("a"), listing("b")], [listing("c")]]
+    monkeypatch.setattr(devfolio, "PRIZE_CACHE_FILE", tmp_path / "prizes.json")
+    client = fake_client(fake_api(pages, prize_calls))
+
+    first = run_fetch(client)
+    assert [h.title for h in first] == ["Hack a", "Hack b", "Hack c"]
+    assert all(h.prize_pool == "- Winner: $500" for h in first)
+    assert sorted(prize_calls) == ["a", "b", "c"]
+
+    prize_calls.clear()
+    pages[0][1] = listing("b", location="Berlin")
+    pages[1].append(listing("d"))
+
+    second = run_fetch(client)
+    assert [h.title for h in second] == ["Hack a", "Hack b", "Hack c", "Hack d"]
+    assert sorted(prize_calls) == ["b", "d"]
+
+
+def test_json_cache_expires_entries(tmp_path):
+    cache = JsonCache(tmp_path / "cache.json", ttl=-1)
+    cache.set("slug", {"prize_pool": "x"})
+    assert cache.get("slug") is None
+
+    cache = JsonCache(tmp_path / "cache.json", ttl=60)
+    cache.set("slug", {"prize_pool": "x"})
+    cache.save()
+    assert JsonCache(tmp_path / "cache.json", ttl=60).get("slug") == {"prize_pool": "x"}
@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+
+import bot
+from backend.db import SessionLocal
+from backend.models import DMChannel
+from services.dm_channels import DMChannelCache
+
+
+def fake_bot(cached_users=()):
+    dm_channel = SimpleNamespace(id=500, send=AsyncMock())
+    user = SimpleNamespace(dm_channel=None, create_dm=AsyncMock(return_value=dm_channel))
+    return SimpleNamespace(
+        get_user=lambda user_id: user if user_id in cached_users else None,
+        fetch_user=AsyncMock(return_value=user),
+        get_partial_messageable=MagicMock(
+            side_effect=lambda channel_id: SimpleNamespace(id=channel_id, send=AsyncMock())
+        ),
+        user=user,
+    )
+
+
+def test_dm_channel_is_opened_once_and_persisted(db_session):
+    client = fake_bot()
+    cache = DMChannelCache(session_factory=SessionLocal)
+
+    async def lookups():
+        return [await cache.channel_for(client, 42) for _ in range(3)]
+
+    channels = asyncio.run(lookups())
+
+    client.fetch_user.assert_awaited_once_with(42)
+    client.user.create_dm.assert_awaited_once()
+    assert [c.id for c in channels] == [500, 500, 500]
+    assert cache.snapshot() == {"hits": 2, "db_hits": 0, "misses": 1}
+    assert db_session.get(DMChannel, 42).channel_id == 500
+
+    # A restarted bot finds the channel in the database without asking Discord.
+    restarted = fake_bot()
+    channel = asyncio.run(DMChannelCache(session_factory=SessionLocal).channel_for(restarted, 42))
+    assert channel.id == 500
+    restarted.fetch_user.assert_not_awaited()
+
+
+def test_cached_user_is_not_fetched():
+    client = fake_bot(cached_users={7})
+
+    asyncio.run(DMChannelCache(session_factory=SessionLocal).channel_for(client, 7))
+
+    client.fetch_user.assert_not_awaited()
+    client.user.create_dm.assert_awaited_once()
+
+
+def test_concurrent_cold_lookups_load_the_table_once(db_session, monkeypatch):
+    db_session.add(DMChannel(user_id=1, channel_id=10))
+    db_session.commit()
+    cache = DMChannelCache(session_factory=SessionLocal)
+    loads = []
+    load = cache._load
+    monkeypatch.setattr(cache, "_load", lambda: (loads.append(1), load()))
+
+    async def lookups():
+        return await asyncio.gather(*(cache.lookup(1) for _ in range(16)))
+
+    assert asyncio.run(lookups()) == [10] * 16
+    assert loads == [1]
+
+
+def test_lru_evicts_least_recently_used(db_session):
+    cache = DMChannelCache(maxsize=2, session_factory=SessionLocal)
+    cache._loaded = True
+    for user_id in (1, 2, 1, 3):
+        cache._remember(user_id, user_id * 10)
+
+    assert list(cache._channels) == [1, 3]
+
+
+def test_unknown_cached_channel_is_reopened(db_session, monkeypatch):
+    db_session.add(DMChannel(user_id=9, channel_id=111))
+    db_session.commit()
+    client = fake_bot()
+    stale = SimpleNamespace(
+        id=111,
+        send=AsyncMock(side_effect=discord.NotFound(SimpleNamespace(status=404, reason=""), "")),
+    )
+    client.get_partial_messageable = MagicMock(return_value=stale)
+    monkeypatch.setattr(bot, "dm_channels", DMChannelCache(session_factory=SessionLocal))
+    monkeypatch.setattr(bot, "format_hackathon_embed", lambda _: ("hello", None, None))
+
+    hack = SimpleNamespace(title="Hack")
+    asyncio.run(bot.send_subscriber_alerts(client, 9, [hack]))
+
+    client.user.create_dm.assert_awaited_once()
+    assert client.user.create_dm.return_value.send.await_count == 1
+    db_session.expire_all()
+    assert db_session.get(DMChannel, 9).channel_id == 500
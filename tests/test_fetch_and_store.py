@@ -0,0 +1,164 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+
+import fetch_and_store
+from adapters import devfolio
+from backend.crud import get_source_watermark, update_source_watermark
+from backend.models import HackathonDB
+from backend.schemas import Hackathon
+
+
+def build_hack(hack_id: str, source: str):
+    return Hackathon(
+        id=hack_id,
+        title=f"Hack {hack_id}",
+        start_date=date.today() + timedelta(days=1),
+        end_date=date.today() + timedelta(days=3),
+        location="Online",
+        url=f"https://example.com/{hack_id}",
+        mode="Online",
+        status="Open",
+        source=source,
+        tags=["ai"],
+    )
+
+
+def fake_source(source: str, ids: list[str], clients: list):
+    async def fetch(client, known_ids=None):
+        clients.append(client)
+        for hack_id in ids:
+            await asyncio.sleep(0)
+            yield build_hack(hack_id, source)
+
+    return fetch
+
+
+def test_run_drives_all_sources_on_one_shared_client(monkeypatch, db_session):
+    clients = []
+    monkeypatch.setattr(
+        fetch_and_store,
+        "SOURCES",
+        [
+            ("Devpost", fake_source("devpost", ["a1", "a2"], clients)),
+            ("Unstop", fake_source("unstop", ["b1"], clients)),
+        ],
+    )
+
+    new_hackathons = fetch_and_store.run()
+
+    assert sorted(h.id for h in new_hackathons) == ["a1", "a2", "b1"]
+    assert len(clients) == 2 and clients[0] is clients[1]
+    assert db_session.query(HackathonDB).count() == 3
+
+    assert fetch_and_store.run() == []
+
+
+def test_non_incremental_source_sends_validators_on_every_run(
+    monkeypatch, tmp_path, db_session, fake_client
+):
+    listing = {
+        "name": "Hack a",
+        "slug": "a",
+        "starts_at": f"{date.today() + timedelta(days=5)}T00:00:00Z",
+        "ends_at": f"{date.today() + timedelta(days=7)}T00:00:00Z",
+    }
+
+    def handler(url, params, headers):
+        if url.endswith("/prizes"):
+            return 200, []
+        etag = f'"page-{params["page"]}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, None, {"ETag": etag}
+        return 200, {"result": [listing] if params["page"] == 1 else []}, {"ETag": etag}
+
+    client = fake_client(handler)
+
+    @asynccontextmanager
+    async def shared_client():
+        yield client
+
+    monkeypatch.setattr(fetch_and_store, "create_client", shared_client)
+    monkeypatch.setattr(fetch_and_store, "SOURCES", [("Devfolio", devfolio.fetch)])
+    monkeypatch.setattr(devfolio, "PRIZE_CACHE_FILE", tmp_path / "prizes.json")
+
+    assert [h.title for h in fetch_and_store.run()] == ["Hack a"]
+    client.requests.clear()
+
+    assert fetch_and_store.run() == []
+    first_page = next(r for r in client.requests if r[1].get("page") == 1)
+    assert first_page[2]["If-None-Match"] == '"page-1"'
+
+
+def test_failing_source_does_not_affect_others(monkeypatch):
+    async def broken(client):
+        raise RuntimeError("boom")
+        yield
+
+    monkeypatch.setattr(
+        fetch_and_store,
+        "SOURCES",
+        [("Broken", broken), ("Devpost", fake_source("devpost", ["c1"], []))],
+    )
+
+    assert [h.id for h in fetch_and_store.run()] == ["c1"]
+
+
+def paged_source(source: str, pages: list[list[str]], calls: list):
+    """Newest-first source that honours `known_ids` like the real incremental adapters."""
+
+    async def fetch(client, known_ids=None):
+        calls.append(known_ids)
+        for ids in pages:
+            if known_ids is not None and all(hack_id in known_ids for hack_id in ids):
+                return
+            for hack_id in ids:
+                yield build_hack(hack_id, source)
+
+    return fetch
+
+
+def test_incremental_run_stops_at_known_page(monkeypatch, db_session):
+    calls = []
+    pages = [["n1", "n2"], ["o1", "o2"]]
+    monkeypatch.setattr(
+        fetch_and_store, "SOURCES", [("Devpost", paged_source("devpost", pages, calls))]
+    )
+
+    assert len(fetch_and_store.run()) == 4
+    assert calls[-1] is None  # no watermark yet, so the first run is a full one
+
+    pages.insert(0, ["n3"])
+    assert [h.id for h in fetch_and_store.run()] == ["n3"]
+    assert calls[-1] == {"n1", "n2", "o1", "o2"}
+
+    watermark = get_source_watermark(db_session, "devpost")
+    assert set(watermark.known_ids.split(",")) == {"n1", "n2", "n3", "o1", "o2"}
+
+
+def test_full_resync_when_forced_or_overdue(monkeypatch, db_session):
+    calls = []
+    monkeypatch.setattr(
+        fetch_and_store, "SOURCES", [("Unstop", paged_source("unstop", [["u1"]], calls))]
+    )
+    fetch_and_store.run()
+    fetch_and_store.run(full_resync=True)
+    assert calls == [None, None]
+
+    fetch_and_store.run()
+    assert calls[-1] == {"u1"}
+
+    watermark = get_source_watermark(db_session, "unstop")
+    watermark.last_full_sync = datetime.now() - fetch_and_store.FULL_RESYNC_INTERVAL * 2
+    db_session.commit()
+    fetch_and_store.run()
+    assert calls[-1] is None
+
+
+def test_full_resync_drops_ids_no_longer_listed(db_session):
+    update_source_watermark(db_session, "dorahacks", ["a", "b"], full_sync=True)
+    update_source_watermark(db_session, "dorahacks", ["c"])
+    assert get_source_watermark(db_session, "dorahacks").known_ids == "a,b,c"
+
+    watermark = update_source_watermark(db_session, "dorahacks", ["b", "d"], full_sync=True)
+    assert watermark.known_ids == "b,d"
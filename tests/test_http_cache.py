@@ -0,0 +1,89 @@
+import asyncio
+
+from adapters import devpost
+from adapters.cache import close_http_cache, http_cache
+from adapters.http import collect, get_json_cached
+
+
+def devpost_item(item_id: int):
+    return {
+        "id": item_id,
+        "title": f"Devpost {item_id}",
+        "submission_period_dates": "Jan 10 - 20, 2099",
+        "displayed_location": {"location": "Online"},
+        "url": f"https://example.com/{item_id}",
+        "open_state": "open",
+        "themes": [{"name": "AI"}],
+    }
+
+
+def etag_server(pages: dict[int, list]):
+    """Serve Devpost-shaped pages, answering 304 when If-None-Match matches the page."""
+
+    def handler(url, params, headers):
+        page = int(url.rsplit("=", 1)[1])
+        etag = f'"page-{page}-{len(pages.get(page, []))}"'
+        if headers.get("If-None-Match") == etag:
+            return 304, None, {"ETag": etag}
+        return 200, {"hackathons": pages.get(page, [])}, {"ETag": etag}
+
+    return handler
+
+
+def test_conditional_request_sends_validators_and_reuses_body(fake_client):
+    client = fake_client(lambda url, params, headers: (200, {"ok": 1}, {"ETag": '"v1"'}))
+    cache = http_cache("example")
+
+    async def run():
+        first = await get_json_cached(client, "https://example.com/api", cache=cache)
+        client.handler = lambda url, params, headers: (304, None, {})
+        second = await get_json_cached(client, "https://example.com/api", cache=cache)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == ({"ok": 1}, True)
+    assert second == ({"ok": 1}, False)
+    assert client.requests[1][2]["If-None-Match"] == '"v1"'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_unchanged_pages_are_not_parsed_again(fake_client):
+    pages = {1: [devpost_item(1), devpost_item(2)], 2: [devpost_item(3)]}
+    client = fake_client(etag_server(pages))
+
+    first = asyncio.run(collect(devpost.fetch, client))
+    assert len(first) == 3
+    close_http_cache("devpost")
+
+    pages[2] = [devpost_item(3), devpost_item(4)]
+    second = asyncio.run(collect(devpost.fetch, client))
+
+    assert [h.title for h in second] == ["Devpost 3", "Devpost 4"]
+    cache = close_http_cache("devpost")
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_unsaved_cache_does_not_short_circuit_next_run(fake_client):
+    client = fake_client(etag_server({1: [devpost_item(1)]}))
+
+    asyncio.run(collect(devpost.fetch, client))
+    close_http_cache("devpost", persist=False)
+
+    assert len(asyncio.run(collect(devpost.fetch, client))) == 1
+
+
+def test_unconditional_cache_refetches_but_keeps_validators(fake_client):
+    pages = {1: [devpost_item(1)]}
+    client = fake_client(etag_server(pages))
+    asyncio.run(collect(devpost.fetch, client))
+    close_http_cache("devpost")
+
+    http_cache("devpost", conditional=False)
+    resync = asyncio.run(collect(devpost.fetch, client))
+
+    assert [h.title for h in resync] == ["Devpost 1"]
+    assert all("If-None-Match" not in headers for _, _, headers in client.requests[3:])
+    cache = close_http_cache("devpost")
+    key = cache.request_key("https://devpost.com/api/hackathons?page=1")
+    assert cache.get(key)["etag"] == '"page-1-1"'
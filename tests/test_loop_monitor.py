@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import bot
+from services.delivery import DeliveryReport
+from services.loop_monitor import LoopLagMonitor
+
+
+def test_monitor_records_blocking_call():
+    async def run():
+        monitor = LoopLagMonitor(interval=0.01, warn_threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.1)  # blocks the loop
+        await asyncio.sleep(0.03)
+        monitor.stop()
+        return monitor.snapshot()
+
+    snapshot = asyncio.run(run())
+
+    assert snapshot["samples"] > 0
+    assert snapshot["max_ms"] >= 50
+    assert snapshot["stalls"] >= 1
+
+
+def test_scrape_runs_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def fake_run():
+        threads.append(threading.current_thread().name)
+        time.sleep(0.1)
+        return []
+
+    monkeypatch.setattr(bot, "fetch_and_store_hackathons", fake_run)
+    monkeypatch.setattr(
+        bot,
+        "outbox_worker",
+        SimpleNamespace(expand=AsyncMock(), deliver=AsyncMock(return_value=DeliveryReport())),
+    )
+
+    async def run():
+        monitor = LoopLagMonitor(interval=0.01)
+        monkeypatch.setattr(bot, "loop_monitor", monitor)
+        monitor.start()
+        await bot.check_and_notify_hackathons.coro(SimpleNamespace(guilds=[object()]))
+        monitor.stop()
+        return monitor.snapshot()
+
+    snapshot = asyncio.run(run())
+
+    assert threads and threads[0].startswith("scrape")
+    assert snapshot["samples"] > 0
+    assert snapshot["max_ms"] < 100
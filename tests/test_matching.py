@@ -0,0 +1,90 @@
+import random
+from types import SimpleNamespace
+
+from services.matching import ThemeIndex, match_subscribers
+
+
+def naive_match(subscriptions, hackathons):
+    """The original nested loop from bot.notify_subscribers."""
+    user_notifications = {}
+    for hackathon in hackathons:
+        hack_tags = [t.lower() for t in hackathon.tags] if hackathon.tags else []
+        for user_id, theme in subscriptions:
+            if any(theme.lower() in tag for tag in hack_tags):
+                hacks = user_notifications.setdefault(user_id, [])
+                if hackathon not in hacks:
+                    hacks.append(hackathon)
+    return user_notifications
+
+
+def test_theme_index_finds_overlapping_and_nested_themes():
+    index = ThemeIndex([(1, "AI"), (2, "ai/ml"), (3, "Chain"), (4, "blockchain"), (5, "in")])
+
+    assert index.themes_in("Generative AI/ML") == {"ai", "ai/ml"}
+    assert index.themes_in("blockchain") == {"ai", "chain", "blockchain", "in"}
+    assert index.match(["web3", "Blockchain"]) == {1, 3, 4, 5}
+    assert index.match([]) == set()
+
+
+def test_match_subscribers_agrees_with_the_naive_loop():
+    rng = random.Random(3)
+    alphabet = "abcde /"
+    words = ["".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(60)]
+    subscriptions = [(rng.randint(1, 40), rng.choice(words).upper()) for _ in range(200)]
+    hackathons = [
+        SimpleNamespace(
+            id=i, tags=["".join(rng.choices(alphabet, k=rng.randint(0, 12))) for _ in range(3)]
+        )
+        for i in range(50)
+    ]
+
+    assert match_subscribers(subscriptions, hackathons) == naive_match(subscriptions, hackathons)
+
+
+def test_guild_filters_match_like_before_and_compare_by_value():
+    from services.matching import compile_guild_filter, prepare_hackathons
+
+    hacks = [
+        SimpleNamespace(source="devpost", tags=["Generative AI", "Web"]),
+        SimpleNamespace(source="Devfolio", tags=["Blockchain"]),
+        SimpleNamespace(source="unstop", tags=[]),
+    ]
+    prepared = prepare_hackathons(hacks)
+
+    assert compile_guild_filter(None, None).apply(prepared) == hacks
+    assert compile_guild_filter("all", "AI").apply(prepared) == hacks[:2]  # "ai" in "blockchain"
+    assert compile_guild_filter("devfolio,unstop", "all").apply(prepared) == hacks[1:]
+    assert compile_guild_filter("Devpost", "web,ml").apply(prepared) == hacks[:1]
+    assert compile_guild_filter("devpost,mlh", "AI") == compile_guild_filter("mlh,devpost", "ai")
+
+
+def test_filter_matrix_agrees_with_per_filter_matching():
+    from services.matching import FilterMatrix, GuildFilter, prepare_hackathons
+
+    rng = random.Random(5)
+    # More than 64 themes, so theme masks span several uint64 words.
+    themes = [f"t{i}" for i in range(150)] + ["ai", "web"]
+    platforms = ["devpost", "unstop", "dev", "mlh"]
+    filters = [
+        GuildFilter(
+            platforms=None if rng.random() < 0.3 else tuple(rng.sample(platforms, 2)),
+            themes=None if rng.random() < 0.3 else tuple(rng.sample(themes, 3)),
+        )
+        for _ in range(300)
+    ]
+    hacks = [
+        SimpleNamespace(
+            source=rng.choice(["Devpost", "devfolio", "unstop", "MLH"]),
+            tags=[
+                rng.choice(themes).upper() + rng.choice(["", "x"]) for _ in range(rng.randint(0, 3))
+            ],
+        )
+        for _ in range(40)
+    ]
+    prepared = prepare_hackathons(hacks)
+
+    matrix = FilterMatrix(filters).match(prepared)
+
+    assert matrix.shape == (300, 40)
+    for row, guild_filter in zip(matrix, filters):
+        assert [hacks[i] for i in row.nonzero()[0]] == guild_filter.apply(prepared)
@@ -1,6 +1,6 @@
 import asyncio
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import bot
 from backend.schemas import Hackathon
@@ -53,13 +53,72 @@ def test_send_paginated_hackathons_routes_by_context(monkeypatch):
     standard = AsyncMock()
     monkeypatch.setattr(bot, "send_scheduled_notification_with_pagination", scheduled)
     monkeypatch.setattr(bot, "send_standard_paginated_notification", standard)
+    monkeypatch.setattr(bot, "NOTIFICATION_LAYOUT", "paginated")
 
     asyncio.run(bot.send_paginated_hackathons(fake_channel, hacks, context_type="scheduled"))
     asyncio.run(bot.send_paginated_hackathons(fake_channel, hacks, context_type="manual"))
     asyncio.run(bot.send_paginated_hackathons(fake_channel, [], context_type="scheduled"))
 
-    scheduled.assert_awaited_once_with(fake_channel, hacks)
-    standard.assert_awaited_once_with(fake_channel, hacks)
+    scheduled.assert_awaited_once_with(fake_channel, hacks, throttle=None)
+    standard.assert_awaited_once_with(fake_channel, hacks, throttle=None)
+
+
+def test_every_fan_out_message_takes_a_token(monkeypatch):
+    calls = []
+    channel = SimpleNamespace(id=5, send=AsyncMock(side_effect=lambda **_: calls.append("send")))
+
+    async def throttle():
+        calls.append("token")
+
+    monkeypatch.setattr(bot, "NOTIFICATION_LAYOUT", "packed")
+    guild = SimpleNamespace(id=1)
+    asyncio.run(
+        bot.deliver_to_guild(guild, channel, [build_hack(f"p{i}") for i in range(25)], throttle)
+    )
+    assert calls == ["token", "send"] * 3
+
+    calls.clear()
+    monkeypatch.setattr(bot.dm_channels, "channel_for", AsyncMock(return_value=channel))
+    hacks = [build_hack("d1"), build_hack("d2")]
+    asyncio.run(bot.send_subscriber_alerts(SimpleNamespace(), 42, hacks, throttle))
+    assert calls == ["token", "send"] * 2
+
+
+def test_scheduled_batches_are_packed_when_they_fit_one_message():
+    fake_channel = SimpleNamespace(send=AsyncMock())
+    hacks = [build_hack(f"p{i}") for i in range(10)]
+
+    asyncio.run(bot.send_paginated_hackathons(fake_channel, hacks, context_type="scheduled"))
+
+    fake_channel.send.assert_awaited_once()
+    kwargs = fake_channel.send.await_args.kwargs
+    assert [embed.title for embed in kwargs["embeds"]] == [h.title for h in hacks]
+    assert [button.url for button in kwargs["view"].children] == [h.url for h in hacks]
+
+
+def test_larger_batches_use_the_paginator_unless_packing_is_forced(monkeypatch):
+    fake_channel = SimpleNamespace(send=AsyncMock())
+    hacks = [build_hack(f"p{i}") for i in range(25)]
+
+    asyncio.run(bot.send_paginated_hackathons(fake_channel, hacks, context_type="scheduled"))
+    assert fake_channel.send.await_count == 2
+
+    fake_channel.send.reset_mock()
+    monkeypatch.setattr(bot, "NOTIFICATION_LAYOUT", "packed")
+    asyncio.run(bot.send_paginated_hackathons(fake_channel, hacks, context_type="scheduled"))
+    assert [len(call.kwargs["embeds"]) for call in fake_channel.send.await_args_list] == [10, 10, 5]
+
+
+def test_pack_hackathon_cards_respects_the_character_budget():
+    hacks = [build_hack(f"p{i}") for i in range(6)]
+    for hack in hacks:
+        hack.prize_pool = "x" * 2500
+
+    packed = bot.pack_hackathon_cards(hacks)
+
+    assert [len(cards) for cards in packed] == [2, 2, 2]
+    assert all(sum(len(card) for _h, card in cards) <= 6000 for cards in packed)
+    assert [h for cards in packed for h, _card in cards] == hacks
 
 
 def test_send_hackathon_notifications_skips_when_missing_permissions(monkeypatch):
@@ -109,3 +168,160 @@ def test_send_hackathon_notifications_target_channel_uses_manual_fetch(monkeypat
         hackathons=hacks,
         context_type="manual_fetch",
     )
+
+
+def test_guilds_with_identical_filters_share_one_match(monkeypatch, db_session):
+    from backend.models import GuildConfig
+    from services.guild_configs import GuildConfigCache
+    from services.matching import FilterMatrix
+
+    monkeypatch.setattr(bot, "match_subscriber_notifications", AsyncMock(return_value={}))
+    matrices = []
+
+    def spy(filters):
+        matrices.append(FilterMatrix(filters))
+        return matrices[-1]
+
+    monkeypatch.setattr(bot, "FilterMatrix", spy)
+    monkeypatch.setattr(bot, "guild_configs", GuildConfigCache())
+
+    db_session.add_all(
+        [
+            GuildConfig(guild_id="1", channel_id="11", subscribed_themes="AI,web"),
+            GuildConfig(guild_id="2", channel_id="22", subscribed_themes="web,ai"),
+            GuildConfig(guild_id="3", channel_id="33", subscribed_platforms="unstop"),
+            GuildConfig(guild_id="4", channel_id="44", notifications_paused="true"),
+        ]
+    )
+    db_session.commit()
+
+    permissions = SimpleNamespace(send_messages=True)
+    channels = {
+        gid: SimpleNamespace(id=gid, permissions_for=lambda _member: permissions)
+        for gid in (11, 22, 33, 44)
+    }
+    guilds = [
+        SimpleNamespace(id=gid, me=object(), get_channel=channels.get) for gid in (1, 2, 3, 4)
+    ]
+    hacks = [build_hack("h1", tags=["AI"]), build_hack("h2", source="unstop", tags=["iot"])]
+
+    targets = asyncio.run(bot.resolve_outbox_targets(SimpleNamespace(guilds=guilds), hacks))
+
+    assert len(matrices[0].filters) == 2
+    assert targets == {"guild:1": hacks[:1], "guild:2": hacks[:1], "guild:3": hacks[1:]}
+
+
+def test_subscriber_alerts_are_batched_into_one_paginated_message(monkeypatch):
+    channel = SimpleNamespace(id=5, send=AsyncMock())
+    monkeypatch.setattr(bot.dm_channels, "channel_for", AsyncMock(return_value=channel))
+    hacks = [build_hack(f"d{i}") for i in range(30)]
+
+    asyncio.run(bot.send_subscriber_alerts(SimpleNamespace(), 42, hacks))
+
+    # A summary and the paginator, however many hackathons matched.
+    assert channel.send.await_count == 2
+    summary = channel.send.await_args_list[0].kwargs["embed"]
+    assert summary.title == "🔔 New Hackathons Matching Your Subscriptions!"
+    assert channel.send.await_args_list[1].kwargs["view"].hackathons == hacks
+
+
+def test_single_subscriber_alert_is_one_message(monkeypatch):
+    channel = SimpleNamespace(id=5, send=AsyncMock())
+    monkeypatch.setattr(bot.dm_channels, "channel_for", AsyncMock(return_value=channel))
+
+    asyncio.run(bot.send_subscriber_alerts(SimpleNamespace(), 42, [build_hack("d1")]))
+
+    channel.send.assert_awaited_once()
+    assert channel.send.await_args.kwargs["content"].startswith("🔔 **New Hackathon Alert!**")
+
+
+def test_guild_fan_out_reads_configs_from_memory(monkeypatch, db_session):
+    from sqlalchemy import event
+
+    from backend.db import async_engine, engine
+    from backend.models import GuildConfig
+    from services.guild_configs import GuildConfigCache
+
+    db_session.add_all(
+        [GuildConfig(guild_id=str(gid), channel_id=str(gid * 11)) for gid in range(1, 51)]
+    )
+    db_session.commit()
+    cache = GuildConfigCache()
+    monkeypatch.setattr(bot, "guild_configs", cache)
+    asyncio.run(cache.load())
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    permissions = SimpleNamespace(send_messages=True)
+    guilds = [
+        SimpleNamespace(
+            id=gid,
+            me=object(),
+            get_channel=lambda cid: SimpleNamespace(id=cid, permissions_for=lambda _m: permissions),
+        )
+        for gid in range(1, 51)
+    ]
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", count)
+    try:
+        plan = bot.plan_guild_notifications(SimpleNamespace(guilds=guilds), [build_hack("h1")])
+    finally:
+        for target in (engine, async_engine.sync_engine):
+            event.remove(target, "before_cursor_execute", count)
+
+    assert len(plan) == 50
+    assert statements == []
+
+
+def test_setup_pause_and_removal_write_through(db_session):
+    from backend import async_crud
+    from backend.db import AsyncSessionLocal
+    from services.guild_configs import GuildConfigCache
+
+    cache = GuildConfigCache()
+    asyncio.run(cache.load())
+
+    async def setup_then_pause():
+        async with AsyncSessionLocal() as db:
+            cache.put(await async_crud.update_guild_preferences(db, "7", "70", ["devpost"], None))
+            if await async_crud.pause_notifications(db, "7"):
+                cache.set_paused("7", True)
+
+    asyncio.run(setup_then_pause())
+    assert (cache.get(7).channel_id, cache.get(7).notifications_paused) == ("70", "true")
+    assert cache.get(7).subscribed_platforms == "devpost"
+
+    # A fresh load from the database agrees with the written-through copy.
+    fresh = GuildConfigCache()
+    asyncio.run(fresh.load())
+    assert fresh.get(7).notifications_paused == "true"
+
+    cache.remove(7)
+    assert cache.get(7) is None
+
+
+def test_startup_survives_a_failed_guild_config_load(monkeypatch, db_session):
+    from backend.models import GuildConfig
+    from services.guild_configs import GuildConfigCache
+
+    cache = GuildConfigCache()
+    monkeypatch.setattr(cache, "load", AsyncMock(side_effect=RuntimeError("db down")))
+    monkeypatch.setattr(bot, "guild_configs", cache)
+    monkeypatch.setattr(bot, "loop_monitor", SimpleNamespace(start=lambda: None))
+    for task in ("check_and_notify_hackathons", "drain_notification_outbox"):
+        monkeypatch.setattr(bot, task, SimpleNamespace(is_running=lambda: False, start=MagicMock()))
+
+    asyncio.run(bot.MyClient.setup_hook(SimpleNamespace()))
+
+    bot.drain_notification_outbox.start.assert_called_once()
+    assert not cache.loaded
+
+    # The cache loads on first use once the database is back.
+    monkeypatch.delattr(cache, "load")
+    db_session.add(GuildConfig(guild_id="1", channel_id="11"))
+    db_session.commit()
+    asyncio.run(cache.ensure_loaded())
+    assert cache.get(1).channel_id == "11"
@@ -0,0 +1,180 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+from backend.crud import (
+    BROADCAST,
+    bulk_upsert_hackathons,
+    claim_outbox,
+    enqueue_outbox,
+    finish_outbox,
+    prune_outbox,
+)
+from backend.models import OutboxEntry
+from backend.schemas import Hackathon
+from services.delivery import DeliveryScheduler
+from services.outbox import OutboxWorker
+
+
+def build_hack(hack_id: str) -> Hackathon:
+    return Hackathon(
+        id=hack_id,
+        title=f"Hack {hack_id}",
+        start_date=date.today() + timedelta(days=1),
+        end_date=date.today() + timedelta(days=3),
+        location="Online",
+        url=f"https://example.com/{hack_id}",
+        mode="Online",
+        status="Open",
+        source="devpost",
+        tags=["ai"],
+    )
+
+
+def statuses(db):
+    db.expire_all()
+    return {(row.target, row.hackathon_id): row.status for row in db.query(OutboxEntry)}
+
+
+def test_bulk_upsert_queues_only_new_hackathons(db_session):
+    bulk_upsert_hackathons(db_session, [build_hack("o1")])
+    bulk_upsert_hackathons(db_session, [build_hack("o1"), build_hack("o2")])
+    bulk_upsert_hackathons(db_session, [build_hack("o3")], notify=False)
+
+    assert statuses(db_session) == {(BROADCAST, "o1"): "pending", (BROADCAST, "o2"): "pending"}
+
+
+def test_claims_never_share_rows_and_expired_leases_return(db_session):
+    bulk_upsert_hackathons(db_session, [build_hack("o1")], notify=False)
+    enqueue_outbox(db_session, "guild:1", ["o1"])
+    db_session.commit()
+
+    first, claimed = claim_outbox(db_session, timedelta(minutes=5))
+    second, nothing = claim_outbox(db_session, timedelta(minutes=5))
+    assert claimed == {"guild:1": ["o1"]}
+    assert nothing == {}
+
+    # A worker that died mid-send leaves the row "sending" until its lease runs out.
+    db_session.query(OutboxEntry).update({"claimed_until": datetime.now() - timedelta(seconds=1)})
+    db_session.commit()
+    third, reclaimed = claim_outbox(db_session, timedelta(minutes=5))
+    assert reclaimed == {"guild:1": ["o1"]}
+
+    finish_outbox(db_session, first, "guild:1")  # the stale claim no longer holds the row
+    assert statuses(db_session) == {("guild:1", "o1"): "sending"}
+    finish_outbox(db_session, third, "guild:1")
+    assert statuses(db_session) == {("guild:1", "o1"): "sent"}
+
+
+def test_failed_sends_retry_until_max_attempts(db_session):
+    bulk_upsert_hackathons(db_session, [build_hack("o1")], notify=False)
+    enqueue_outbox(db_session, "user:7", ["o1"])
+    db_session.commit()
+
+    for _ in range(2):
+        token, claimed = claim_outbox(db_session, timedelta(minutes=5))
+        assert claimed == {"user:7": ["o1"]}
+        finish_outbox(db_session, token, "user:7", error="403 Forbidden", max_attempts=2)
+
+    assert statuses(db_session) == {("user:7", "o1"): "failed"}
+    assert claim_outbox(db_session, timedelta(minutes=5))[1] == {}
+    assert db_session.query(OutboxEntry).one().last_error == "403 Forbidden"
+
+
+def test_worker_expands_broadcasts_and_delivers_each_target_once(db_session):
+    from backend.db import SessionLocal
+
+    hacks = [build_hack("o1"), build_hack("o2")]
+    bulk_upsert_hackathons(db_session, hacks)
+    sent = []
+    failing = {"user:9"}
+
+    async def resolve_targets(new_hackathons):
+        assert [h.id for h in new_hackathons] == ["o1", "o2"]
+        return {"guild:1": new_hackathons, "user:9": new_hackathons[1:]}
+
+    async def send(target, hackathons, throttle):
+        await throttle()
+        if target in failing:
+            raise RuntimeError("DMs closed")
+        sent.append((target, [h.id for h in hackathons]))
+
+    worker = OutboxWorker(DeliveryScheduler(rate=1000), session_factory=SessionLocal)
+
+    async def drain():
+        await worker.expand(resolve_targets)
+        return await worker.deliver(send)
+
+    report = asyncio.run(drain())
+    assert sent == [("guild:1", ["o1", "o2"])]
+    assert report.snapshot()["failed"] == 1
+    assert statuses(db_session)[("user:9", "o2")] == "pending"
+    assert statuses(db_session)[(BROADCAST, "o1")] == "sent"
+
+    # Failed targets wait out the retry delay; the next drain after it retries only them.
+    assert asyncio.run(drain()).latencies == {}
+    db_session.query(OutboxEntry).filter(OutboxEntry.status == "pending").update(
+        {"claimed_until": datetime.now() - timedelta(seconds=1)}
+    )
+    db_session.commit()
+    failing.clear()
+    asyncio.run(drain())
+    assert sent == [("guild:1", ["o1", "o2"]), ("user:9", ["o2"])]
+    assert set(statuses(db_session).values()) == {"sent"}
+
+
+def test_deliver_drains_every_batch(db_session):
+    from backend.db import SessionLocal
+
+    bulk_upsert_hackathons(db_session, [build_hack("o1")], notify=False)
+    targets = ["guild:1", "guild:2", "user:3"]
+    for target in targets:
+        enqueue_outbox(db_session, target, ["o1"])
+    db_session.commit()
+    sent = []
+
+    async def send(target, hackathons, throttle):
+        await throttle()
+        sent.append(target)
+
+    worker = OutboxWorker(DeliveryScheduler(rate=1000), batch_size=1, session_factory=SessionLocal)
+    report = asyncio.run(worker.deliver(send))
+
+    assert sent == targets
+    assert report.snapshot()["delivered"] == 3
+    assert set(statuses(db_session).values()) == {"sent"}
+
+
+def test_prune_removes_only_old_finished_rows(db_session):
+    bulk_upsert_hackathons(db_session, [build_hack("o1")], notify=False)
+    for target in ("guild:1", "guild:2", "user:3", "user:4"):
+        enqueue_outbox(db_session, target, ["o1"])
+    db_session.commit()
+    rows = {row.target: row for row in db_session.query(OutboxEntry)}
+    rows["guild:1"].status = "sent"
+    rows["user:3"].status = "failed"
+    rows["user:4"].status = "sent"
+    for target in ("guild:1", "guild:2", "user:3"):
+        rows[target].created_at = datetime.now() - timedelta(days=30)
+    db_session.commit()
+
+    assert prune_outbox(db_session, timedelta(days=7)) == 2
+    assert statuses(db_session) == {("guild:2", "o1"): "pending", ("user:4", "o1"): "sent"}
+
+
+def test_prune_compares_against_the_database_clock(db_session, monkeypatch):
+    import time
+
+    bulk_upsert_hackathons(db_session, [build_hack("o1")], notify=False)
+    enqueue_outbox(db_session, "guild:1", ["o1"])
+    db_session.commit()
+    db_session.query(OutboxEntry).update({"status": "sent"})
+    db_session.commit()
+
+    # A host ahead of UTC must not see a row queued just now as hours old.
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    time.tzset()
+    try:
+        assert prune_outbox(db_session, timedelta(hours=1)) == 0
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,75 @@
+import asyncio
+import random
+
+import pytest
+
+from adapters.pagination import fetch_pages
+
+
+def make_fetcher(total_pages: int, stats: dict, fail_on: int | None = None):
+    async def fetch_page(page):
+        stats["in_flight"] += 1
+        stats["peak"] = max(stats["peak"], stats["in_flight"])
+        try:
+            await asyncio.sleep(random.uniform(0, 0.01))
+            if page == fail_on:
+                raise RuntimeError(f"page {page} failed")
+            return [f"item-{page}"] if page <= total_pages else None
+        finally:
+            stats["in_flight"] -= 1
+
+    return fetch_page
+
+
+async def drain(pages):
+    return [page async for page in pages]
+
+
+@pytest.mark.parametrize("last_page", [10, None])
+def test_pages_are_yielded_in_order_with_bounded_concurrency(last_page):
+    stats = {"in_flight": 0, "peak": 0}
+
+    results = asyncio.run(
+        drain(fetch_pages(make_fetcher(10, stats), last_page=last_page, concurrency=3))
+    )
+
+    assert [page for page, _ in results] == list(range(1, 11))
+    assert results[0][1] == ["item-1"]
+    assert stats["peak"] <= 3
+
+
+def test_probing_stops_at_first_empty_page():
+    stats = {"in_flight": 0, "peak": 0}
+
+    results = asyncio.run(drain(fetch_pages(make_fetcher(5, stats), first_page=2, concurrency=4)))
+
+    assert [page for page, _ in results] == [2, 3, 4, 5]
+
+
+def test_error_is_raised_after_earlier_pages():
+    stats = {"in_flight": 0, "peak": 0}
+    seen = []
+
+    async def run():
+        async for page, _ in fetch_pages(make_fetcher(10, stats, fail_on=4), last_page=10):
+            seen.append(page)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert seen == [1, 2, 3]
+
+
+def test_stopping_early_bounds_wasted_requests():
+    requested = []
+
+    async def fetch_page(page):
+        requested.append(page)
+        return [page]
+
+    async def run():
+        async for page, _ in fetch_pages(fetch_page, last_page=50, concurrency=3):
+            if page == 2:
+                break
+
+    asyncio.run(run())
+    assert max(requested) <= 5
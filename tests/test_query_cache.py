@@ -0,0 +1,85 @@
+import asyncio
+from datetime import date, timedelta
+from unittest.mock import AsyncMock
+
+import bot
+import fetch_and_store
+from backend.schemas import Hackathon
+from services.query_cache import QueryCache
+
+
+def build_hack(hack_id: str, title: str = "Cache Jam"):
+    return Hackathon(
+        id=hack_id,
+        title=title,
+        start_date=date.today() + timedelta(days=1),
+        end_date=date.today() + timedelta(days=3),
+        location="Online",
+        url=f"https://example.com/{hack_id}",
+        mode="Online",
+        status="Open",
+        source="devpost",
+        tags=["ai"],
+    )
+
+
+def test_read_through_hits_and_ttl():
+    cache = QueryCache(ttl=60)
+    load = AsyncMock(return_value=["row"])
+
+    async def run():
+        return [await cache.get("k", load) for _ in range(3)]
+
+    assert asyncio.run(run()) == [["row"]] * 3
+    assert load.await_count == 1
+    assert cache.snapshot()["hits"] == 2
+
+    cache.ttl = -1  # every entry written from now on is already expired
+    cache.invalidate()
+    asyncio.run(run())
+    assert load.await_count == 4
+
+
+def test_lru_eviction_and_empty_results():
+    cache = QueryCache(maxsize=2)
+
+    async def run():
+        for key in ("a", "b", "a", "c"):
+            await cache.get(key, AsyncMock(return_value=[key]))
+        await cache.get("empty", AsyncMock(return_value=[]))
+
+    asyncio.run(run())
+    assert list(cache._entries) == ["a", "c"]
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = QueryCache()
+
+    async def stale_load():
+        cache.invalidate()  # a scrape committed while the query was running
+        return ["stale"]
+
+    assert asyncio.run(cache.get("k", stale_load)) == ["stale"]
+    assert len(cache) == 0
+
+
+def test_upcoming_is_served_from_cache_until_a_scrape_changes_rows(monkeypatch):
+    cache = QueryCache()
+    monkeypatch.setattr(bot, "discovery_cache", cache)
+    monkeypatch.setattr(fetch_and_store, "discovery_cache", cache)
+
+    fetch_and_store.store_hackathons("Devpost", [build_hack("c1")])
+
+    async def upcoming():
+        return await bot.cached_hackathons(
+            ("upcoming", 7), bot.async_crud.get_upcoming_hackathons, 7
+        )
+
+    assert [h.id for h in asyncio.run(upcoming())] == ["c1"]
+    fetch_and_store.store_hackathons("Devpost", [build_hack("c1")])  # unchanged: still cached
+    assert asyncio.run(upcoming())[0].id == "c1"
+    assert cache.snapshot()["hits"] == 1
+
+    fetch_and_store.store_hackathons("Devpost", [build_hack("c1", "Renamed Jam")])
+    assert asyncio.run(upcoming())[0].title == "Renamed Jam"
+    assert cache.snapshot()["invalidations"] == 2
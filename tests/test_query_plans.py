@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event, text
+
+from backend.crud import (
+    bulk_upsert_hackathons,
+    get_hackathons_by_platform,
+    get_upcoming,
+    get_upcoming_hackathons,
+    suggest_tags,
+)
+from backend.db import engine
+from backend.init_db import normalize_sources
+from backend.schemas import Hackathon
+
+
+def build_hack(hack_id: str, source: str, days: int = 1):
+    return Hackathon(
+        id=hack_id,
+        title=f"Hack {hack_id}",
+        start_date=date.today() + timedelta(days=days),
+        end_date=date.today() + timedelta(days=days + 2),
+        location="Online",
+        url=f"https://example.com/{hack_id}",
+        mode="Online",
+        status="Open",
+        source=source,
+        tags=["ai"],
+    )
+
+
+def query_plan(db, call) -> str:
+    """Run `call` and return the database's plan for the SELECT it issued."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            # Tiny test tables are cheaper to scan; ask whether an index *can* serve the query.
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            rows = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+        else:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def test_platform_lookup_uses_the_source_start_date_index(db_session):
+    plan = query_plan(db_session, lambda: get_hackathons_by_platform(db_session, "Devpost"))
+
+    assert "idx_hackathons_source_start_date" in plan
+
+
+def test_upcoming_range_uses_the_start_date_index(db_session):
+    plan = query_plan(db_session, lambda: get_upcoming_hackathons(db_session, 7))
+
+    assert "idx_hackathons_start_date" in plan
+
+
+def test_upcoming_by_sources_uses_the_source_start_date_index(db_session):
+    plan = query_plan(
+        db_session,
+        lambda: get_upcoming(
+            db_session, from_date=date.today(), to_date=date.today(), sources=["MLH", "unstop"]
+        ),
+    )
+
+    assert "idx_hackathons_source_start_date" in plan
+
+
+def test_theme_suggestions_use_the_tag_index(db_session):
+    plan = query_plan(db_session, lambda: suggest_tags(db_session, "ai"))
+
+    assert "idx_hackathon_tags_tag" in plan
+
+
+def test_sources_are_normalized_on_write_and_lookup(db_session):
+    bulk_upsert_hackathons(db_session, [build_hack("k1", " Kaggle ")], notify=False)
+
+    assert [h.id for h in get_hackathons_by_platform(db_session, "KAGGLE")] == ["k1"]
+    assert [h.id for h in get_upcoming(db_session, sources=["Kaggle"])] == ["k1"]
+
+
+def test_existing_sources_are_lowercased(db_session):
+    bulk_upsert_hackathons(db_session, [build_hack("m1", "mlh")], notify=False)
+    db_session.execute(text("UPDATE hackathons SET source = 'MLH' WHERE id = 'm1'"))
+    db_session.commit()
+
+    normalize_sources()
+
+    assert [h.id for h in get_hackathons_by_platform(db_session, "mlh")] == ["m1"]
@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+import bot
+from services.query_cache import QueryCache
+from services.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_call():
+    flights = SingleFlight()
+    started = []
+
+    async def load():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return ["row"]
+
+    async def run():
+        same = await asyncio.gather(*(flights.do("k", load) for _ in range(10)))
+        other = await flights.do("other", load)
+        return same, other
+
+    same, other = asyncio.run(run())
+
+    assert same == [["row"]] * 10
+    assert other == ["row"]
+    assert len(started) == 2
+    assert flights.snapshot() == {"calls": 2, "coalesced": 9, "coalesced_ratio": 0.818}
+    assert len(flights) == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_remembered():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database is down")
+
+    async def run():
+        return await asyncio.gather(
+            *(flights.do("k", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    assert [str(e) for e in asyncio.run(run())] == ["database is down"] * 3
+    assert asyncio.run(flights.do("k", AsyncMock(return_value=["ok"]))) == ["ok"]
+
+
+def test_a_waiter_giving_up_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return ["row"]
+
+    async def run():
+        impatient = asyncio.ensure_future(flights.do("k", load))
+        patient = asyncio.ensure_future(flights.do("k", load))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+        return await patient
+
+    assert asyncio.run(run()) == ["row"]
+
+
+def test_concurrent_discovery_commands_run_one_query(monkeypatch):
+    monkeypatch.setattr(bot, "discovery_cache", QueryCache())
+    monkeypatch.setattr(bot, "discovery_flights", SingleFlight())
+    queries = []
+
+    async def get_upcoming(db, days):
+        queries.append(days)
+        await asyncio.sleep(0.01)
+        return []
+
+    async def run():
+        return await asyncio.gather(
+            *(bot.cached_hackathons(("upcoming", 7), get_upcoming, 7) for _ in range(20))
+        )
+
+    assert asyncio.run(run()) == [[]] * 20
+    assert queries == [7]
+    assert bot.discovery_flights.snapshot()["coalesced"] == 19